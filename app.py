@@ -1,8 +1,8 @@
 import streamlit as st
 import pandas as pd
-from utils.data_generator import generate_listings_data
-from utils.visualization import create_metric_cards
-from pages.auth import init_auth, login_page, auth_required
+from utils.dataset_cache import get_dataset, dataset_cache, dataset_store, refresh_stored_datasets, ingest_report
+from utils.visualization import create_metric_cards, create_metric_deltas
+from pages.auth import init_auth, login_page, auth_required, admin_required, is_admin
 
 # Set dark theme as default
 st.set_page_config(
@@ -117,6 +117,8 @@ def show_dashboard():
             "📈 ROI Calculator": "roi_calculator",
             "⚙️ Settings": "settings"
         }
+        if is_admin():
+            pages["🛠️ Admin"] = "admin"
 
         selected = st.radio(
             "Navigation",
@@ -141,24 +143,30 @@ def show_dashboard():
         show_roi_calculator()
     elif "Settings" in selected:
         show_settings()
+    elif "Admin" in selected:
+        show_admin()
 
 def show_main_dashboard():
     st.title("Your Airbnb Market Analysis Dashboard")
 
-    # Quick Stats
-    df = generate_listings_data()
-    metrics = create_metric_cards(df)
+    # Quick Stats from running aggregates; deltas compare the latest month
+    # of listings with the month before
+    store = get_dataset('metric_store')
+    metrics = create_metric_cards(store=store)
+    deltas = create_metric_deltas(store)
 
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric("Average Price", metrics['Average Price'], delta="↑ 5%")
+        st.metric("Average Price", metrics['Average Price'], delta=deltas.get('Average Price'))
     with col2:
-        st.metric("Average Rating", metrics['Average Rating'], delta="↑ 0.2")
+        st.metric("Average Rating", metrics['Average Rating'], delta=deltas.get('Average Rating'))
     with col3:
-        st.metric("Occupancy Rate", metrics['Occupancy Rate'], delta="↑ 3%")
+        st.metric("Occupancy Rate", metrics['Occupancy Rate'], delta=deltas.get('Occupancy Rate'))
     with col4:
-        st.metric("Total Properties", "156", delta="↑ 12")
+        st.metric("Total Properties", f"{store.count:,}", delta=deltas.get('Total Properties'))
+
+    show_percentile_panel()
 
     # Feature cards
     st.markdown("""
@@ -182,6 +190,47 @@ def show_main_dashboard():
     </div>
     """, unsafe_allow_html=True)
 
+def show_percentile_panel():
+    st.subheader("📍 Where Your Property Ranks")
+    index = get_dataset('listings_index')
+    ranker = get_dataset('market_ranker')
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        neighborhood = st.selectbox("Compare Within Neighborhood", ["All"] + index.options('neighborhood'))
+        property_type = st.selectbox("Compare Within Property Type", ["All"] + index.options('property_type'))
+    with col2:
+        price = st.number_input("Your Nightly Price (₹)", min_value=0, value=5000, step=100)
+        rating = st.slider("Your Rating", 1.0, 5.0, 4.5, step=0.1)
+    with col3:
+        occupancy = st.slider("Your Occupancy Rate (%)", 0, 100, 65)
+        reviews = st.number_input("Your Review Count", min_value=0, value=100)
+
+    ranks = ranker.rank(
+        {'price': price, 'rating': rating, 'occupancy_rate': occupancy / 100, 'reviews_count': reviews},
+        neighborhood=neighborhood,
+        property_type=property_type
+    )
+    segment_size = ranker.segment_size(neighborhood, property_type)
+    if not segment_size:
+        st.info("No listings in this segment yet.")
+        return
+
+    # A metric nobody in the segment has yet cannot be ranked
+    def percentile_label(rank):
+        return "n/a" if pd.isna(rank) else f"P{rank:.0f}"
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Price Percentile", percentile_label(ranks['price']))
+    with col2:
+        st.metric("Rating Percentile", percentile_label(ranks['rating']))
+    with col3:
+        st.metric("Occupancy Percentile", percentile_label(ranks['occupancy_rate']))
+    with col4:
+        st.metric("Reviews Percentile", percentile_label(ranks['reviews_count']))
+    st.caption(f"Ranked against {segment_size:,} listings in this segment")
+
 def show_settings():
     st.title("⚙️ Account Settings")
     with st.form("profile_settings"):
@@ -189,6 +238,78 @@ def show_settings():
         st.text_input("Email", value=st.session_state.user.email, disabled=True)
         st.form_submit_button("Update Profile")
 
+@admin_required
+def show_admin():
+    st.title("🛠️ Admin")
+    st.subheader("Dataset Cache")
+    stats = dataset_cache.stats()
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Hits", stats['hits'])
+    with col2:
+        st.metric("Misses", stats['misses'])
+    with col3:
+        st.metric("Evictions", stats['evictions'] + stats['expirations'])
+    with col4:
+        st.metric("Hit Rate", f"{stats['hit_rate']*100:.1f}%")
+
+    st.caption(
+        f"{len(stats['entries'])} cached datasets using "
+        f"{stats['total_bytes'] / 1024**2:.1f} MB of {stats['max_bytes'] / 1024**2:.0f} MB "
+        f"(TTL {dataset_cache.ttl:.0f}s)"
+    )
+    if stats['entries']:
+        st.dataframe(pd.DataFrame([
+            {
+                'Dataset': entry['dataset'],
+                'Parameters': str(entry['params']),
+                'Size (MB)': round(entry['size_bytes'] / 1024**2, 2),
+                'Age (s)': round(entry['age_seconds'])
+            }
+            for entry in stats['entries']
+        ]), use_container_width=True)
+
+    if st.button("Clear Cache"):
+        dataset_cache.clear()
+        st.rerun()
+
+    report = ingest_report()
+    if report:
+        st.subheader("Listing Ingest")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Rows Kept", f"{report['rows_kept']:,}", f"-{report['rows_dropped']:,} dropped", delta_color="off")
+        with col2:
+            st.metric("Rows/sec", f"{report['rows_per_sec']:,.0f}")
+        with col3:
+            st.metric("Peak Memory", f"{report['peak_memory_mb']:.0f} MB")
+        with col4:
+            st.metric("Frame Size", f"{report['frame_memory_mb']:.1f} MB")
+        st.caption(f"Ingested {report['rows_read']:,} rows in {report['seconds']:.1f}s")
+
+    st.subheader("Dataset Store")
+    if dataset_store is None:
+        st.caption("The memory-mapped store is disabled (DATASET_STORE_DIR is empty).")
+        return
+    stored = dataset_store.entries()
+    st.caption(f"{len(stored)} stored tables in {dataset_store.root}")
+    if stored:
+        st.dataframe(pd.DataFrame([
+            {
+                'Dataset': entry['dataset'],
+                'Parameters': str(entry['params']),
+                'Version': entry['version'],
+                'Rows': entry['rows'],
+                'Size (MB)': round(entry['bytes'] / 1024**2, 2)
+            }
+            for entry in stored
+        ]), use_container_width=True)
+
+    if st.button("Refresh Stored Datasets"):
+        refresh_stored_datasets()
+        st.rerun()
+
 def show_market_analysis():
     from pages.market_analysis import main
     main()
@@ -0,0 +1,165 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from functools import partial
+from utils.data_generator import generate_competitor_data, PLATFORM_FACTORS
+from utils.roi import calculate_roi, monthly_revenue
+
+REQUIRED_COLUMNS = [
+    'purchase_price',
+    'nightly_rate',
+    'occupancy_rate',
+    'monthly_expenses',
+    'appreciation_rate'
+]
+
+# Optional portfolio columns; when present, each property is compared with
+# competitors in the same segment instead of the whole market
+SEGMENT_COLUMNS = ['property_type', 'neighborhood', 'bedrooms']
+
+# Output columns added to the portfolio, in order
+RESULT_COLUMNS = {
+    'roi': float,
+    'annual_profit': float,
+    'total_return': float,
+    'segment_competitors': np.int64,
+    'market_percentile': float,
+    'vs_market_median_pct': float,
+    'closest_platform': object,
+    'vs_closest_platform_pct': float
+}
+
+# Competitor market loaded once per worker by the pool initializer
+_market = {}
+
+def _init_worker(competitor_samples, seed, segment_columns):
+    # Competitor prices are in INR; portfolio rates are converted to match
+    competitors = generate_competitor_data(competitor_samples, label_dtype='category', seed=seed)
+    platforms = list(PLATFORM_FACTORS)
+    _market['platforms'] = np.array(platforms, dtype=object)
+    _market['segment_columns'] = list(segment_columns)
+    _market['segments'] = {}
+    groups = competitors.groupby(segment_columns, observed=True) if segment_columns else [((), competitors)]
+    for key, group in groups:
+        means = group.groupby('platform', observed=True)['price'].mean()
+        _market['segments'][key] = {
+            'prices': np.sort(group['price'].to_numpy()),
+            'platform_means': means.reindex(platforms).to_numpy()
+        }
+
+def _compare_segment(rates, segment):
+    # Percentile, gap to the median and closest platform of rates within one
+    # segment's competitors; platforms missing from the segment are skipped
+    prices = segment['prices']
+    means = segment['platform_means']
+    percentile = np.searchsorted(prices, rates, side='right') / len(prices) * 100
+    with np.errstate(invalid='ignore'):
+        gaps = (rates[:, None] - means[None, :]) / means[None, :] * 100
+    closest = np.nanargmin(np.abs(gaps), axis=1)
+    return {
+        'segment_competitors': len(prices),
+        'market_percentile': percentile,
+        'vs_market_median_pct': (rates / np.median(prices) - 1) * 100,
+        'closest_platform': _market['platforms'][closest],
+        'vs_closest_platform_pct': gaps[np.arange(len(rates)), closest]
+    }
+
+def analyze_chunk(chunk, fx_rate):
+    roi, annual_profit, total_return = calculate_roi(
+        chunk['purchase_price'].to_numpy(),
+        monthly_revenue(chunk['nightly_rate'].to_numpy(), chunk['occupancy_rate'].to_numpy()),
+        chunk['monthly_expenses'].to_numpy(),
+        chunk['appreciation_rate'].to_numpy()
+    )
+    result = pd.DataFrame({
+        'roi': roi,
+        'annual_profit': annual_profit,
+        'total_return': total_return
+    }, index=chunk.index)
+    for column, dtype in RESULT_COLUMNS.items():
+        if column not in result:
+            result[column] = pd.Series(0 if dtype is np.int64 else None, index=chunk.index, dtype=dtype)
+
+    # Rates in INR, compared segment by segment; properties in a segment
+    # without competitors keep empty comparison columns
+    rates = chunk['nightly_rate'].to_numpy(dtype=float) * fx_rate
+    columns = _market['segment_columns']
+    groups = chunk.groupby(columns, observed=True, sort=False).indices if columns else {(): np.arange(len(chunk))}
+    for key, positions in groups.items():
+        segment = _market['segments'].get(key)
+        if segment is not None:
+            for column, values in _compare_segment(rates[positions], segment).items():
+                result.iloc[positions, result.columns.get_loc(column)] = values
+    return result
+
+def read_portfolio(path):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+def write_results(df, path):
+    if path.endswith('.csv'):
+        df.to_csv(path, index=False)
+    else:
+        df.to_parquet(path, index=False)
+
+def run(portfolio, fx_rate, workers=None, chunk_size=5000, competitor_samples=5000, seed=42):
+    # fx_rate: rupees per unit of the portfolio's currency (1 for INR rates)
+    missing = [c for c in REQUIRED_COLUMNS if c not in portfolio.columns]
+    if missing:
+        raise ValueError(f"Portfolio is missing columns: {', '.join(missing)}")
+    if not fx_rate or fx_rate <= 0:
+        raise ValueError("fx_rate must be a positive number of rupees per portfolio currency unit")
+
+    chunks = [portfolio.iloc[i:i + chunk_size] for i in range(0, len(portfolio), chunk_size)]
+    if not chunks:
+        return portfolio.assign(**{
+            column: pd.Series(dtype=dtype) for column, dtype in RESULT_COLUMNS.items()
+        })
+
+    segment_columns = [c for c in SEGMENT_COLUMNS if c in portfolio.columns]
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(competitor_samples, seed, segment_columns)
+    ) as executor:
+        # Chunks are handed out as workers free up, so uneven chunks balance out
+        results = list(executor.map(partial(analyze_chunk, fx_rate=fx_rate), chunks))
+    return portfolio.join(pd.concat(results))
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run ROI and competitor price analysis over a portfolio file."
+    )
+    parser.add_argument('portfolio', help="CSV or Parquet file with one property per row")
+    parser.add_argument('output', help="results file (.parquet, or .csv)")
+    parser.add_argument('--fx-rate', type=float, required=True,
+                        help="rupees per unit of the portfolio's currency; competitor prices are in INR "
+                             "(use 1 if nightly_rate is already in INR)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--competitor-samples', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    portfolio = read_portfolio(args.portfolio)
+    results = run(
+        portfolio,
+        fx_rate=args.fx_rate,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        competitor_samples=args.competitor_samples,
+        seed=args.seed
+    )
+    write_results(results, args.output)
+    elapsed = time.perf_counter() - start
+
+    print(f"Processed {len(results):,} properties in {elapsed:.2f}s "
+          f"({len(results) / elapsed:,.0f} properties/sec) -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Login lookup latency with and without the connection pool.
+
+Runs User.get_by_email from many concurrent sessions. Without --dsn an
+in-process stand-in simulates the connect handshake and query round trip.
+
+    python benchmarks/login_pool.py --sessions 100 --logins 20
+    python benchmarks/login_pool.py --dsn postgresql://localhost/airbnb
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import psycopg2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import db
+from models.user import User
+
+class StandInCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params=None):
+        time.sleep(self.conn.query_latency)
+
+    def fetchone(self):
+        return (1, 'host@example.com', 'hash', 'Host')
+
+    def close(self):
+        pass
+
+class StandInConnection:
+    def __init__(self, connect_latency, query_latency):
+        # TCP + TLS + auth handshake
+        time.sleep(connect_latency)
+        self.query_latency = query_latency
+        self.closed = 0
+
+    def cursor(self):
+        return StandInCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+def run(connect, pooled, sessions, logins, maxconn):
+    if pooled:
+        db.configure_pool(connect, minconn=min(4, maxconn), maxconn=maxconn)
+    else:
+        # Old behaviour: every checkout opens and closes a fresh connection
+        db.configure_pool(connect, minconn=0, maxconn=sessions)
+        pool = db.get_pool()
+        pool.putconn = lambda conn, discard=False: pool._discard(conn)
+
+    latencies = []
+    lock = threading.Lock()
+
+    def session(_):
+        local = []
+        for _ in range(logins):
+            start = time.perf_counter()
+            User.get_by_email('host@example.com')
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        list(executor.map(session, range(sessions)))
+    elapsed = time.perf_counter() - start
+    db.get_pool().closeall()
+
+    latencies = np.array(latencies) * 1000
+    return {
+        'mode': 'pooled' if pooled else 'connect-per-query',
+        'p50_ms': np.percentile(latencies, 50),
+        'p95_ms': np.percentile(latencies, 95),
+        'p99_ms': np.percentile(latencies, 99),
+        'logins_per_sec': len(latencies) / elapsed
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dsn', help='benchmark a real Postgres instead of the stand-in')
+    parser.add_argument('--sessions', type=int, default=100)
+    parser.add_argument('--logins', type=int, default=20)
+    parser.add_argument('--maxconn', type=int, default=20)
+    parser.add_argument('--connect-ms', type=float, default=15.0)
+    parser.add_argument('--query-ms', type=float, default=0.5)
+    args = parser.parse_args()
+
+    if args.dsn:
+        connect = lambda: psycopg2.connect(args.dsn)
+    else:
+        connect = lambda: StandInConnection(args.connect_ms / 1000, args.query_ms / 1000)
+
+    for pooled in (False, True):
+        result = run(connect, pooled, args.sessions, args.logins, args.maxconn)
+        print(
+            f"{result['mode']:>18}: p50 {result['p50_ms']:7.2f} ms  "
+            f"p95 {result['p95_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  "
+            f"{result['logins_per_sec']:8.0f} logins/s"
+        )
+
+if __name__ == '__main__':
+    main()
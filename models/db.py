@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import psycopg2
+from psycopg2.pool import PoolError
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+
+class ConnectionPool:
+    def __init__(self, connect, minconn=1, maxconn=10, timeout=30, check_after=30):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Pool size must satisfy 0 <= minconn <= maxconn and maxconn >= 1")
+
+        self._connect = connect
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        # Idle connections older than this are pinged before being handed out
+        self.check_after = check_after
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        for _ in range(minconn):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def _is_healthy(self, conn, idle_since):
+        if conn.closed:
+            return False
+        if time.monotonic() - idle_since < self.check_after:
+            return True
+        try:
+            cur = conn.cursor()
+            try:
+                cur.execute("SELECT 1")
+                cur.fetchone()
+            finally:
+                cur.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._size >= self.maxconn:
+                    remaining = deadline - time.monotonic()
+                    if self._closed:
+                        raise PoolError("connection pool is closed")
+                    if remaining <= 0:
+                        raise PoolError(f"no connection available within {self.timeout}s")
+                    self._cond.wait(remaining)
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                else:
+                    # Reserve the slot, then connect without holding the lock
+                    self._size += 1
+                    conn, idle_since = None, None
+
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    self._release_slot()
+                    raise
+
+            if self._is_healthy(conn, idle_since):
+                return conn
+            self._discard(conn)
+
+    def putconn(self, conn, discard=False):
+        if not discard and not conn.closed:
+            try:
+                # End any implicit transaction left open by read-only queries
+                conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        if discard or conn.closed or self._closed:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, conn):
+        try:
+            if not conn.closed:
+                conn.close()
+        finally:
+            self._release_slot()
+
+    def _release_slot(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            # putconn rolls back uncommitted work and drops broken connections
+            self.putconn(conn)
+
+    def closeall(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            if not conn.closed:
+                conn.close()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _create_pool(connect=None, minconn=None, maxconn=None, **kwargs):
+    global _pool
+    if _pool is not None:
+        _pool.closeall()
+    _pool = ConnectionPool(
+        connect or (lambda: psycopg2.connect(DATABASE_URL)),
+        minconn=int(os.environ.get("DB_POOL_MIN", 1)) if minconn is None else minconn,
+        maxconn=int(os.environ.get("DB_POOL_MAX", 10)) if maxconn is None else maxconn,
+        **kwargs
+    )
+    return _pool
+
+def configure_pool(connect=None, minconn=None, maxconn=None, **kwargs):
+    with _pool_lock:
+        return _create_pool(connect, minconn, maxconn, **kwargs)
+
+def get_pool():
+    # Process-wide pool shared by every Streamlit session, created on first use
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _create_pool()
+    return _pool
@@ -0,0 +1,74 @@
+import threading
+from models.db import get_pool
+
+# Arbitrary application-wide key for pg_advisory_lock, so concurrent server
+# processes never run the same migration twice
+MIGRATION_LOCK_KEY = 7_402_115
+
+# Ordered schema steps. Append new (version, name, sql) entries; never edit
+# or reorder ones that may already have been applied.
+MIGRATIONS = [
+    (1, 'create users table', '''
+        CREATE TABLE IF NOT EXISTS users (
+            id SERIAL PRIMARY KEY,
+            email VARCHAR(255) UNIQUE NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            full_name VARCHAR(255),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    '''),
+]
+
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+def migrate(conn):
+    cur = conn.cursor()
+    applied = []
+    try:
+        cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+        try:
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name VARCHAR(255) NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.commit()
+
+            cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+            current = cur.fetchone()[0]
+
+            # Each step and its version row commit together
+            for version, name, sql in MIGRATIONS:
+                if version <= current:
+                    continue
+                cur.execute(sql)
+                cur.execute(
+                    "INSERT INTO schema_version (version, name) VALUES (%s, %s)",
+                    (version, name)
+                )
+                conn.commit()
+                applied.append(version)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+            conn.commit()
+    finally:
+        cur.close()
+    return applied
+
+def ensure_schema():
+    global _schema_ready
+    # Only the first call in a process touches the database
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if _schema_ready:
+            return
+        with get_pool().connection() as conn:
+            migrate(conn)
+        _schema_ready = True
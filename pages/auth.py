@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 from models.user import User, init_db
 
@@ -176,4 +177,28 @@ def auth_required(func):
             login_page()
             return
         return func(*args, **kwargs)
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+# Comma-separated emails allowed on the Admin page; empty means nobody
+ADMIN_EMAILS = {
+    email.strip().lower()
+    for email in os.environ.get("ADMIN_EMAILS", "").split(",")
+    if email.strip()
+}
+
+def is_admin():
+    user = st.session_state.get('user')
+    return bool(
+        st.session_state.get('is_authenticated', False)
+        and user is not None
+        and user.email
+        and user.email.lower() in ADMIN_EMAILS
+    )
+
+def admin_required(func):
+    def wrapper(*args, **kwargs):
+        if not is_admin():
+            st.error("You do not have access to this page")
+            return
+        return func(*args, **kwargs)
+    return wrapper
@@ -1,37 +1,64 @@
 import streamlit as st
 import pandas as pd
-from utils.data_generator import generate_listings_data, generate_seasonal_data
-from utils.visualization import create_price_distribution_plot, create_occupancy_trend
+from utils.dataset_cache import get_dataset
+from utils.visualization import (
+    create_binned_price_distribution_plot,
+    create_occupancy_trend,
+    figure_payload_bytes
+)
+from utils.forecasting import forecast_prices
 
 def main():
     st.title("📊 Market Analysis Dashboard")
     
-    # Filter controls
+    # Filter options come from the index, so they always match the data
+    index = get_dataset('listings_index')
     col1, col2 = st.columns(2)
     with col1:
         property_type = st.selectbox(
             "Property Type",
-            ["All", "Apartment", "House", "Villa", "Condo", "Studio"]
+            ["All"] + index.options('property_type')
         )
     with col2:
         neighborhood = st.selectbox(
             "Neighborhood",
-            ["All", "Downtown", "Suburb", "Beach Area", "Historic District", "Business District"]
+            ["All"] + index.options('neighborhood')
         )
     
-    # Generate and filter data
-    df = generate_listings_data()
-    if property_type != "All":
-        df = df[df['property_type'] == property_type]
-    if neighborhood != "All":
-        df = df[df['neighborhood'] == neighborhood]
+    # Filter through precomputed row positions instead of full scans
+    df = index.select(property_type=property_type, neighborhood=neighborhood)
     
-    # Price distribution
-    st.plotly_chart(create_price_distribution_plot(df), use_container_width=True)
+    # Price distribution from server-side bins of the selected index cells
+    histogram = get_dataset('price_histogram')
+    counts = histogram.counts(index.cells(property_type=property_type, neighborhood=neighborhood))
+    price_fig = create_binned_price_distribution_plot(histogram.edges, counts)
+    st.plotly_chart(price_fig, use_container_width=True)
+    st.caption(f"Chart payload: {figure_payload_bytes(price_fig) / 1024:.1f} KB")
     
     # Seasonal trends
-    seasonal_data = generate_seasonal_data()
-    st.plotly_chart(create_occupancy_trend(seasonal_data), use_container_width=True)
+    horizon = st.selectbox("Trend Horizon", ["1 Year", "3 Years", "5 Years", "10 Years"])
+    start = pd.Timestamp('2023-01-01')
+    end = start + pd.DateOffset(years=int(horizon.split()[0])) - pd.Timedelta(days=1)
+    # Long windows are drawn from weekly/monthly rollups instead of daily rows
+    seasonal_params = dict(
+        start=start,
+        end=end,
+        neighborhoods=None if neighborhood == "All" else [neighborhood]
+    )
+    rollups = get_dataset('seasonal_rollups', **seasonal_params)
+    first_day, last_day = (day.date() for day in rollups.span())
+    window = st.slider("Zoom", min_value=first_day, max_value=last_day, value=(first_day, last_day))
+    forecast_days = st.slider("Forecast (days)", min_value=0, max_value=365, value=90, step=30)
+    # The fitted model is cached with the series, so reruns only evaluate it
+    forecast = forecast_prices(get_dataset('seasonal_model', **seasonal_params), forecast_days) if forecast_days else None
+    anomalies = get_dataset('seasonal_anomalies', **seasonal_params) if st.checkbox("Show price spikes and dips") else None
+    st.plotly_chart(
+        create_occupancy_trend(
+            rollups=rollups, max_points=1500, webgl=True, window=window,
+            forecast=forecast, anomalies=anomalies
+        ),
+        use_container_width=True
+    )
     
     # Property listings
     st.subheader("Nearby Properties")
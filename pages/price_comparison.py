@@ -1,13 +1,23 @@
 import streamlit as st
 import pandas as pd
-from utils.data_generator import generate_competitor_data
+from utils.dataset_cache import get_dataset
 from utils.visualization import create_competitor_comparison
+from utils.recommender import seasonal_uplifts, recommend_price
+from utils.amenities import (
+    AMENITY_VOCABULARY,
+    BASIC_AMENITIES,
+    PREMIUM_AMENITIES,
+    LOCATION_FEATURES,
+    rank_by_amenities
+)
+
+COMPETITOR_SAMPLES = 2000
 
 def main():
     st.title("💰 Price Comparison Analysis")
 
     # Property details input
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     with col1:
         bedrooms = st.number_input("Number of Bedrooms", min_value=1, max_value=10, value=2)
     with col2:
@@ -17,6 +27,11 @@ def main():
             "Property Type",
             ["Apartment", "Villa", "Bungalow", "Farmhouse", "Heritage Home", "Studio"]
         )
+    with col4:
+        neighborhood = st.selectbox(
+            "Neighborhood",
+            get_dataset('listings_index').options('neighborhood')
+        )
 
     # Indian-specific amenities
     st.subheader("Amenities")
@@ -25,75 +40,104 @@ def main():
     with col1:
         basic_amenities = st.multiselect(
             "Basic Amenities",
-            [
-                "WiFi", "TV", "Kitchen", "Washing Machine",
-                "Power Backup", "Water Purifier", "Geyser",
-                "24/7 Water Supply", "Parking"
-            ],
+            BASIC_AMENITIES,
             ["WiFi", "Kitchen"]
         )
 
     with col2:
         premium_amenities = st.multiselect(
             "Premium Amenities",
-            [
-                "AC (Split/Window)", "Swimming Pool", "Gym",
-                "Garden/Terrace", "Security System", "Elevator",
-                "Club House Access", "Servants Quarter",
-                "Private Pool", "BBQ Area"
-            ]
+            PREMIUM_AMENITIES
         )
 
     # Location features
     st.subheader("Location Features")
     location_features = st.multiselect(
         "Select Nearby Features",
-        [
-            "Metro Station", "Shopping Mall", "Restaurant",
-            "Hospital", "School/College", "Temple",
-            "Park", "Market", "Airport", "Beach"
-        ]
+        LOCATION_FEATURES
     )
 
     # Generate competitor data
-    df = generate_competitor_data()
+    df = get_dataset('competitor', n_samples=COMPETITOR_SAMPLES)
 
     # Display comparison chart
-    st.plotly_chart(create_competitor_comparison(df), use_container_width=True)
+    st.plotly_chart(create_competitor_comparison(df, summary=True), use_container_width=True)
 
-    # Platform-wise analysis
+    # Platform-wise analysis from the materialized aggregate cube
     st.subheader("Platform Analysis")
+    scope = st.radio(
+        "Compare against",
+        ["All listings", "Same property type", "Same type & neighborhood", "Same type, neighborhood & bedrooms"],
+        horizontal=True
+    )
+    filters = {}
+    if scope != "All listings":
+        filters['property_type'] = property_type
+    if scope in ("Same type & neighborhood", "Same type, neighborhood & bedrooms"):
+        filters['neighborhood'] = neighborhood
+    if scope == "Same type, neighborhood & bedrooms":
+        filters['bedrooms'] = bedrooms
+
+    platforms = get_dataset('competitor_cube', n_samples=COMPETITOR_SAMPLES).rollup(['platform'], **filters).round(2)
+    if platforms.empty:
+        st.info("No competitor listings match this slice.")
 
     # Create columns for platforms
     cols = st.columns(3)
-    platforms = df.groupby('platform').agg({
-        'price': ['mean', 'min', 'max'],
-        'rating': 'mean',
-        'reviews': 'sum'
-    }).round(2)
 
     for idx, platform in enumerate(platforms.index):
         with cols[idx % 3]:
             st.markdown(f"""
             <div style="background-color: #1F2937; padding: 1rem; border-radius: 10px; border: 1px solid #374151; margin-bottom: 1rem;">
                 <h3 style="color: #FF385C; margin-bottom: 0.5rem;">{platform}</h3>
-                <p style="color: #E5E7EB;"><strong>Avg Price:</strong> ₹{platforms.loc[platform, ('price', 'mean')]:,.2f}</p>
+                <p style="color: #E5E7EB;"><strong>Avg Price:</strong> ₹{platforms.loc[platform, 'price_mean']:,.2f}</p>
                 <p style="color: #E5E7EB;"><strong>Price Range:</strong><br/>
-                   ₹{platforms.loc[platform, ('price', 'min')]:,.2f} - ₹{platforms.loc[platform, ('price', 'max')]:,.2f}</p>
-                <p style="color: #E5E7EB;"><strong>Rating:</strong> {platforms.loc[platform, ('rating', 'mean')]:.1f} ⭐</p>
-                <p style="color: #E5E7EB;"><strong>Reviews:</strong> {platforms.loc[platform, ('reviews', 'sum')]:,}</p>
+                   ₹{platforms.loc[platform, 'price_min']:,.2f} - ₹{platforms.loc[platform, 'price_max']:,.2f}</p>
+                <p style="color: #E5E7EB;"><strong>Rating:</strong> {platforms.loc[platform, 'rating_mean']:.1f} ⭐</p>
+                <p style="color: #E5E7EB;"><strong>Reviews:</strong> {int(platforms.loc[platform, 'reviews_sum']):,}</p>
             </div>
             """, unsafe_allow_html=True)
 
-    # Pricing recommendations
+    # Pricing recommendations from the most similar listings in the market
     st.subheader("💡 Pricing Recommendations")
-    st.info("""
-    Based on your property features and location:
-    - Recommended base price: ₹2,500 - ₹3,500 per night
-    - Weekend surge: Add 20-30%
-    - Festival season: Add 40-50%
-    - Long stay discount: 10-15% for weekly bookings
-    """)
+    comparables = get_dataset('price_recommender').comparables(
+        property_type, bedrooms, bathrooms, neighborhood
+    )
+    if comparables.empty:
+        st.warning("No comparable listings found for this property type.")
+    else:
+        bands = recommend_price(comparables, seasonal_uplifts(get_dataset('seasonal', seed=42)))
+        st.info(f"""
+        Based on {bands['n_comparables']} comparable listings near your property:
+        - Recommended base price: ₹{bands['base'][0]:,.0f} - ₹{bands['base'][1]:,.0f} per night
+        - Weekend price: ₹{bands['weekend'][0]:,.0f} - ₹{bands['weekend'][1]:,.0f} (+{bands['weekend_uplift']*100:.0f}%)
+        - Festival season: ₹{bands['festival'][0]:,.0f} - ₹{bands['festival'][1]:,.0f} (+{bands['festival_uplift']*100:.0f}%)
+        - Long stay discount: 10-15% for weekly bookings
+        """)
+        with st.expander("Comparable listings"):
+            st.dataframe(
+                comparables[['property_type', 'neighborhood', 'bedrooms', 'bathrooms', 'price', 'rating']],
+                use_container_width=True
+            )
+
+    # Listings sharing the selected premium amenities, ranked by overall overlap
+    st.subheader("🏊 Listings With Your Premium Amenities")
+    matches = rank_by_amenities(
+        get_dataset('listings'),
+        AMENITY_VOCABULARY.encode(basic_amenities + premium_amenities + location_features),
+        required=AMENITY_VOCABULARY.encode(premium_amenities),
+        top=5
+    )
+    if matches.empty:
+        st.info("No listings offer all of the selected premium amenities.")
+    for _, row in matches.iterrows():
+        st.markdown(f"""
+        <div class="property-card">
+            <h3>{row['property_type']} in {row['neighborhood']}</h3>
+            <p>Price: ₹{row['price']:,.0f}/night • {row['amenity_similarity']*100:.0f}% amenity match</p>
+            <p>{', '.join(AMENITY_VOCABULARY.decode(row['amenity_bits']))}</p>
+        </div>
+        """, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,17 +1,14 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-
-def calculate_roi(purchase_price, monthly_revenue, monthly_expenses, appreciation_rate):
-    annual_revenue = monthly_revenue * 12
-    annual_expenses = monthly_expenses * 12
-    annual_profit = annual_revenue - annual_expenses
-    
-    property_value_after_year = purchase_price * (1 + appreciation_rate/100)
-    total_return = annual_profit + (property_value_after_year - purchase_price)
-    
-    roi = (total_return / purchase_price) * 100
-    return roi, annual_profit, total_return
+from utils.roi import calculate_roi, calculate_roi_grid, monthly_revenue as calculate_monthly_revenue
+from utils.projection import project_portfolio
+from utils.risk_simulation import simulate_roi
+from utils.visualization import (
+    create_roi_heatmap,
+    create_roi_distribution_plot,
+    create_cash_flow_projection
+)
 
 def main():
     st.title("📈 ROI Calculator")
@@ -24,7 +21,7 @@ def main():
     st.subheader("Monthly Revenue")
     nightly_rate = st.number_input("Average Nightly Rate ($)", min_value=0, value=150)
     occupancy_rate = st.slider("Expected Occupancy Rate (%)", 0, 100, 70)
-    monthly_revenue = (nightly_rate * 30 * occupancy_rate/100)
+    monthly_revenue = float(calculate_monthly_revenue(nightly_rate, occupancy_rate))
     
     # Expenses
     st.subheader("Monthly Expenses")
@@ -89,5 +86,141 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
+    # Multi-year projection with a real amortization schedule in place of
+    # the flat mortgage payment
+    st.subheader("Multi-Year Projection")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        down_payment_pct = st.slider("Down Payment (%)", 0, 100, 20)
+        interest_rate = st.number_input("Mortgage Interest Rate (%)", min_value=0.0, max_value=20.0, value=6.5, step=0.1)
+    with col2:
+        loan_years = st.selectbox("Loan Term (years)", [10, 15, 20, 25, 30], index=4)
+        horizon_years = st.slider("Holding Period (years)", 1, 30, 10)
+    with col3:
+        rent_growth = st.slider("Annual Rent Growth (%)", 0.0, 10.0, 3.0)
+        expense_inflation = st.slider("Annual Expense Inflation (%)", 0.0, 10.0, 4.0)
+        discount_rate = st.slider("Discount Rate (%)", 0.0, 20.0, 8.0)
+
+    projection, cash_flows = project_portfolio(
+        {
+            'purchase_price': [purchase_price],
+            'down_payment_pct': [down_payment_pct],
+            'interest_rate': [interest_rate],
+            'loan_years': [loan_years],
+            'monthly_revenue': [monthly_revenue],
+            'monthly_expenses': [monthly_expenses - mortgage],
+            'rent_growth': [rent_growth],
+            'expense_inflation': [expense_inflation],
+            'appreciation_rate': [appreciation_rate]
+        },
+        horizon_years=horizon_years,
+        discount_rate=discount_rate
+    )
+    result = projection.iloc[0]
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("IRR", "n/a" if np.isnan(result['irr']) else f"{result['irr']:.1f}%")
+    with col2:
+        st.metric("NPV", f"${result['npv']:,.0f}")
+    with col3:
+        st.metric("Equity at Exit", f"${result['equity_at_exit']:,.0f}")
+    st.plotly_chart(create_cash_flow_projection(cash_flows[0]), use_container_width=True)
+
+    # Sensitivity analysis
+    st.subheader("Sensitivity Analysis")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        rate_range = st.slider(
+            "Nightly Rate Range ($)", 0, max(1000, int(nightly_rate) * 3),
+            (max(int(nightly_rate) // 2, 1), int(nightly_rate) * 2 or 100)
+        )
+    with col2:
+        occupancy_range = st.slider("Occupancy Range (%)", 0, 100, (30, 100))
+    with col3:
+        resolution = st.select_slider("Grid Resolution", [100, 250, 500, 1000], value=1000)
+
+    nightly_rates = np.linspace(rate_range[0], rate_range[1], resolution)
+    occupancy_rates = np.linspace(occupancy_range[0], occupancy_range[1], resolution)
+    roi_grid = calculate_roi_grid(
+        purchase_price,
+        nightly_rates,
+        occupancy_rates,
+        monthly_expenses,
+        appreciation_rate
+    )
+    st.plotly_chart(
+        create_roi_heatmap(nightly_rates, occupancy_rates, roi_grid),
+        use_container_width=True
+    )
+    st.caption(
+        f"{roi_grid.size:,} scenarios evaluated • "
+        f"{np.mean(roi_grid > 0) * 100:.1f}% of the surface has positive ROI"
+    )
+
+    # Monte Carlo risk analysis
+    st.subheader("Risk Analysis")
+    col1, col2 = st.columns(2)
+    with col1:
+        rate_volatility = st.slider("Nightly Rate Volatility (%)", 0, 50, 15)
+        occupancy_std = st.slider("Occupancy Uncertainty (± %)", 1, 30, 10)
+        n_scenarios = st.select_slider(
+            "Scenarios",
+            [100_000, 1_000_000, 10_000_000],
+            value=1_000_000,
+            format_func=lambda n: f"{n:,}"
+        )
+    with col2:
+        inflation_mean = st.slider("Expected Expense Inflation (%)", 0, 15, 5)
+        inflation_std = st.slider("Inflation Uncertainty (± %)", 0, 10, 3)
+        appreciation_std = st.slider("Appreciation Uncertainty (± %)", 0, 15, 4)
+
+    if st.button("Run Simulation"):
+        progress_bar = st.progress(0.0, text="Simulating scenarios...")
+        result = simulate_roi(
+            {
+                'purchase_price': purchase_price,
+                'nightly_rate': nightly_rate,
+                'nightly_rate_volatility': rate_volatility / 100,
+                'occupancy_rate': occupancy_rate,
+                'occupancy_std': occupancy_std,
+                'monthly_expenses': monthly_expenses,
+                'expense_inflation_mean': inflation_mean,
+                'expense_inflation_std': inflation_std,
+                'appreciation_mean': appreciation_rate,
+                'appreciation_std': appreciation_std
+            },
+            n_scenarios=n_scenarios,
+            progress=lambda done, total: progress_bar.progress(
+                done / total, text=f"Simulated {done:,} of {total:,} scenarios"
+            )
+        )
+        progress_bar.empty()
+        if result['out_of_range']:
+            st.warning(
+                f"{result['out_of_range']:,} scenarios fell outside the simulated ROI range "
+                f"({result['edges'][0]:.0f}% to {result['edges'][-1]:.0f}%); "
+                "percentiles in the tails may be capped at the range limits."
+            )
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("P5 ROI", f"{result['p5']:.1f}%")
+        with col2:
+            st.metric("P50 ROI", f"{result['p50']:.1f}%")
+        with col3:
+            st.metric("P95 ROI", f"{result['p95']:.1f}%")
+        with col4:
+            st.metric("Probability of Loss", f"{result['probability_of_loss'] * 100:.1f}%")
+
+        st.plotly_chart(
+            create_roi_distribution_plot(
+                result['edges'],
+                result['counts'],
+                bands={'P5': result['p5'], 'P50': result['p50'], 'P95': result['p95']}
+            ),
+            use_container_width=True
+        )
+
 if __name__ == "__main__":
     main()
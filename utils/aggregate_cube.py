@@ -0,0 +1,63 @@
+import pandas as pd
+
+CUBE_DIMENSIONS = ['platform', 'property_type', 'neighborhood', 'bedrooms']
+
+# Mergeable partial aggregates kept per cell, and how two cells combine
+CELL_AGGREGATES = {
+    'count': ('price', 'size', 'sum'),
+    'price_sum': ('price', 'sum', 'sum'),
+    'price_min': ('price', 'min', 'min'),
+    'price_max': ('price', 'max', 'max'),
+    'rating_sum': ('rating', 'sum', 'sum'),
+    'reviews_sum': ('reviews', 'sum', 'sum')
+}
+
+class AggregateCube:
+    # Materialized aggregates per platform x property type x neighborhood x
+    # bedrooms; any slice or roll-up is computed from the cells alone
+    def __init__(self, competitors=None, dimensions=CUBE_DIMENSIONS):
+        self.dimensions = list(dimensions)
+        self.cells = pd.DataFrame(columns=list(CELL_AGGREGATES))
+        if competitors is not None:
+            self.merge(competitors)
+
+    @property
+    def nbytes(self):
+        return int(self.cells.memory_usage(deep=True).sum())
+
+    def _aggregate(self, competitors):
+        return competitors.groupby(self.dimensions, observed=True).agg(**{
+            name: (column, how) for name, (column, how, _) in CELL_AGGREGATES.items()
+        })
+
+    def merge(self, competitors):
+        # New scrapes are aggregated on their own and folded into the cells
+        new = self._aggregate(competitors)
+        if self.cells.empty:
+            self.cells = new
+            return
+        combined = pd.concat([self.cells, new])
+        self.cells = combined.groupby(level=self.dimensions, observed=True).agg({
+            name: combine for name, (_, _, combine) in CELL_AGGREGATES.items()
+        })
+
+    def rollup(self, dimensions=('platform',), **filters):
+        cells = self.cells.reset_index()
+        for column, value in filters.items():
+            if value is not None and value != "All":
+                cells = cells[cells[column] == value]
+
+        # Rolling up to no dimensions at all gives a single market-wide row
+        keys = list(dimensions) or (lambda _: 'All')
+        grouped = cells.groupby(keys, observed=True).agg({
+            name: combine for name, (_, _, combine) in CELL_AGGREGATES.items()
+        })
+
+        return pd.DataFrame({
+            'count': grouped['count'],
+            'price_mean': grouped['price_sum'] / grouped['count'],
+            'price_min': grouped['price_min'],
+            'price_max': grouped['price_max'],
+            'rating_mean': grouped['rating_sum'] / grouped['count'],
+            'reviews_sum': grouped['reviews_sum']
+        })
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+class RunningStats:
+    # Count, mean and Welford M2; batches are folded in with Chan's parallel
+    # update, so each new value costs O(1) and nothing is rescanned. Missing
+    # and non-finite values are skipped, so count is the number of values seen.
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        if pd.isna(value) or np.isinf(value):
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if len(values):
+            batch = RunningStats()
+            batch.count = len(values)
+            batch.mean = float(values.mean())
+            batch.m2 = float(((values - batch.mean) ** 2).sum())
+            self.merge(batch)
+
+    def merge(self, other):
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+
+    @property
+    def total(self):
+        return self.mean * self.count
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+class MetricStore:
+    # Running aggregates per metric, overall and per time window (listing date
+    # bucketed by `freq`), for period-over-period deltas without rescans
+    def __init__(self, metrics=('price', 'rating', 'occupancy_rate'), freq='M'):
+        self.metrics = list(metrics)
+        self.freq = freq
+        self.overall = {metric: RunningStats() for metric in self.metrics}
+        self.windows = {}
+        # Listings seen, overall and per window; metric counts leave out
+        # listings with that metric missing
+        self.count = 0
+        self.window_counts = {}
+
+    def _window(self, period):
+        if period not in self.windows:
+            self.windows[period] = {metric: RunningStats() for metric in self.metrics}
+        return self.windows[period]
+
+    def add(self, listing, date):
+        period = pd.Period(date, self.freq)
+        window = self._window(period)
+        self.count += 1
+        self.window_counts[period] = self.window_counts.get(period, 0) + 1
+        for metric in self.metrics:
+            self.overall[metric].add(listing[metric])
+            window[metric].add(listing[metric])
+
+    def add_listings(self, listings, date_column='listed_date'):
+        periods = listings[date_column].dt.to_period(self.freq)
+        self.count += len(listings)
+        for metric in self.metrics:
+            self.overall[metric].update(listings[metric])
+        for period, group in listings.groupby(periods, observed=True):
+            window = self._window(period)
+            self.window_counts[period] = self.window_counts.get(period, 0) + len(group)
+            for metric in self.metrics:
+                window[metric].update(group[metric])
+
+    def latest_periods(self):
+        if not self.windows:
+            return None, None
+        current = max(self.windows)
+        return current, current - 1
+
+    def period_stats(self, period):
+        return self.windows.get(period, {metric: RunningStats() for metric in self.metrics})
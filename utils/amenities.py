@@ -0,0 +1,109 @@
+import numpy as np
+
+BASIC_AMENITIES = [
+    "WiFi", "TV", "Kitchen", "Washing Machine",
+    "Power Backup", "Water Purifier", "Geyser",
+    "24/7 Water Supply", "Parking"
+]
+
+PREMIUM_AMENITIES = [
+    "AC (Split/Window)", "Swimming Pool", "Gym",
+    "Garden/Terrace", "Security System", "Elevator",
+    "Club House Access", "Servants Quarter",
+    "Private Pool", "BBQ Area"
+]
+
+LOCATION_FEATURES = [
+    "Metro Station", "Shopping Mall", "Restaurant",
+    "Hospital", "School/College", "Temple",
+    "Park", "Market", "Airport", "Beach"
+]
+
+# Share of synthetic listings that offer each amenity group
+AMENITY_PREVALENCE = {
+    'basic': 0.7,
+    'premium': 0.2,
+    'location': 0.4
+}
+
+class AmenityVocabulary:
+    # Maps amenity names to bit positions; sets become rows of packed uint64
+    # words (one word per 64 amenities)
+    def __init__(self, names):
+        self.names = list(names)
+        self.positions = {name: i for i, name in enumerate(self.names)}
+        self.n_words = max(1, -(-len(self.names) // 64))
+
+    def encode(self, amenities):
+        bits = np.zeros(self.n_words, dtype=np.uint64)
+        for name in amenities:
+            position = self.positions[name]
+            bits[position // 64] |= np.uint64(1) << np.uint64(position % 64)
+        return bits
+
+    def encode_many(self, amenity_lists):
+        return np.stack([self.encode(a) for a in amenity_lists]) if len(amenity_lists) else \
+            np.zeros((0, self.n_words), dtype=np.uint64)
+
+    def pack(self, present):
+        # present: boolean matrix (rows x vocabulary) -> packed words. Bits
+        # are packed to bytes first, so scratch space is one byte per 8 flags.
+        present = np.asarray(present, dtype=bool)
+        packed = np.zeros((len(present), self.n_words * 8), dtype=np.uint8)
+        packed[:, :-(-present.shape[1] // 8)] = np.packbits(present, axis=1, bitorder='little')
+        return packed.view('<u8').astype(np.uint64, copy=False)
+
+    def decode(self, bits):
+        bits = np.atleast_1d(np.asarray(bits, dtype=np.uint64))
+        return [
+            name for name, i in self.positions.items()
+            if (int(bits[i // 64]) >> (i % 64)) & 1
+        ]
+
+AMENITY_VOCABULARY = AmenityVocabulary(BASIC_AMENITIES + PREMIUM_AMENITIES + LOCATION_FEATURES)
+
+# Rows drawn per block in generate_amenity_bits
+AMENITY_BLOCK_ROWS = 65536
+
+def generate_amenity_bits(rng, n_rows, vocabulary=AMENITY_VOCABULARY):
+    prevalence = np.array(
+        [AMENITY_PREVALENCE['basic']] * len(BASIC_AMENITIES)
+        + [AMENITY_PREVALENCE['premium']] * len(PREMIUM_AMENITIES)
+        + [AMENITY_PREVALENCE['location']] * len(LOCATION_FEATURES)
+    )
+    # Uniforms are drawn a block of rows at a time: same stream order as one
+    # (rows x amenities) draw, without its float64 matrix
+    packed = np.empty((n_rows, vocabulary.n_words), dtype=np.uint64)
+    for start in range(0, n_rows, AMENITY_BLOCK_ROWS):
+        block = min(AMENITY_BLOCK_ROWS, n_rows - start)
+        packed[start:start + block] = vocabulary.pack(rng.random((block, len(prevalence))) < prevalence)
+    return packed[:, 0] if vocabulary.n_words == 1 else packed
+
+def _as_words(bitsets):
+    bitsets = np.asarray(bitsets, dtype=np.uint64)
+    return bitsets[:, None] if bitsets.ndim == 1 else bitsets
+
+def jaccard_similarity(bitsets, query):
+    # |A & Q| / |A | Q| for every row at once via popcount; two empty sets
+    # count as identical
+    bitsets = _as_words(bitsets)
+    query = np.atleast_1d(np.asarray(query, dtype=np.uint64))
+    shared = np.bitwise_count(bitsets & query).sum(axis=1, dtype=np.int64)
+    combined = np.bitwise_count(bitsets | query).sum(axis=1, dtype=np.int64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(combined > 0, shared / combined, 1.0)
+
+def contains_all(bitsets, required):
+    bitsets = _as_words(bitsets)
+    required = np.atleast_1d(np.asarray(required, dtype=np.uint64))
+    return ((bitsets & required) == required).all(axis=1)
+
+def rank_by_amenities(listings, query, required=None, top=10, column='amenity_bits'):
+    bitsets = _as_words(np.stack(listings[column].to_numpy()) if listings[column].dtype == object
+                        else listings[column].to_numpy())
+    score = jaccard_similarity(bitsets, query)
+    candidates = np.arange(len(listings))
+    if required is not None:
+        candidates = candidates[contains_all(bitsets, required)]
+    order = candidates[np.argsort(-score[candidates], kind='stable')[:top]]
+    return listings.iloc[order].assign(amenity_similarity=score[order])
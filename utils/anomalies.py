@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from utils.timeseries import series_matrix
+
+# Scales a median absolute deviation to a normal standard deviation
+MAD_SCALE = 1.4826
+
+# Cap on the (days x series x window) median work done at once
+MAX_WINDOW_CELLS = 8_000_000
+
+def _median_mad(windows):
+    # Median and MAD along the last axis. Sorting short contiguous windows is
+    # several times faster than np.median's partition on strided views.
+    size = windows.shape[-1]
+    lower, upper = (size - 1) // 2, size // 2
+    ordered = np.sort(windows, axis=-1)
+    median = (ordered[..., lower] + ordered[..., upper]) / 2
+    # Deviations reuse the sorted copy in place
+    np.subtract(ordered, median[..., None], out=ordered)
+    np.abs(ordered, out=ordered)
+    ordered.sort(axis=-1)
+    return median, (ordered[..., lower] + ordered[..., upper]) / 2
+
+def _robust_scores(values, medians, mads):
+    # Robust z-score; a flat window (MAD of 0) scores nothing
+    scale = MAD_SCALE * mads
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(scale > 0, (values - medians) / scale, 0.0)
+
+def rolling_robust_scores(Y, window=28):
+    # Each day is scored against the median / MAD of the `window` days before
+    # it, for every column of Y at once; the first `window` days get NaN.
+    # Series are processed in blocks to bound the median scratch space, each
+    # laid out series-major so every window is contiguous.
+    n_days, n_series = Y.shape
+    medians = np.full((n_series, n_days), np.nan)
+    scores = np.full((n_series, n_days), np.nan)
+    if n_days <= window:
+        return scores.T, medians.T
+
+    series_major = np.ascontiguousarray(Y.T)
+    block = max(1, MAX_WINDOW_CELLS // (n_days * window))
+    for first in range(0, n_series, block):
+        rows = series_major[first:first + block]
+        median, mad = _median_mad(sliding_window_view(rows, window, axis=1)[:, :-1])
+        medians[first:first + block, window:] = median
+        scores[first:first + block, window:] = _robust_scores(rows[:, window:], median, mad)
+    return scores.T, medians.T
+
+class StreamingAnomalyDetector:
+    # One value per series per step, scored against a ring buffer of the
+    # last `window` values, so state is O(window) per series and the scores
+    # match rolling_robust_scores over the same history
+    def __init__(self, n_series, window=28, threshold=3.5):
+        self.window = window
+        self.threshold = threshold
+        self.buffer = np.zeros((n_series, window))
+        self.position = 0
+        self.filled = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        if self.filled < self.window:
+            scores = np.full(len(values), np.nan)
+            medians = np.full(len(values), np.nan)
+        else:
+            medians, mads = _median_mad(self.buffer)
+            scores = _robust_scores(values, medians, mads)
+
+        self.buffer[:, self.position] = values
+        self.position = (self.position + 1) % self.window
+        self.filled = min(self.filled + 1, self.window)
+        return {
+            'score': scores,
+            'median': medians,
+            'spike': scores > self.threshold,
+            'dip': scores < -self.threshold
+        }
+
+def detect_anomalies(seasonal, window=28, threshold=3.5):
+    # Flagged days of every series in a generate_seasonal_data frame, as a
+    # long frame of events (kind is 'spike' or 'dip')
+    dates, Y, series, keys = series_matrix(seasonal)
+    scores, medians = rolling_robust_scores(Y, window)
+    day, column = np.nonzero(np.abs(np.nan_to_num(scores)) > threshold)
+
+    events = pd.DataFrame({'date': dates[day]})
+    if len(series) == 1:
+        events[series[0]] = pd.Categorical(np.asarray(keys, dtype=object)[column], categories=keys)
+    else:
+        for i, name in enumerate(series):
+            events[name] = pd.Categorical([keys[c][i] for c in column])
+    events['price'] = Y[day, column]
+    events['median'] = medians[day, column]
+    events['score'] = scores[day, column]
+    events['kind'] = np.where(scores[day, column] > 0, 'spike', 'dip')
+    return events.sort_values('date', kind='stable').reset_index(drop=True)
@@ -1,89 +1,236 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-
-def generate_listings_data(n_samples=100):
-    np.random.seed(42)
-
-    property_types = ['Apartment', 'Villa', 'Bungalow', 'Farmhouse', 'Heritage Home', 'Studio']
-    neighborhoods = ['South Delhi', 'Bandra West', 'Koramangala', 'Jubilee Hills', 'Boat Club Road']
-
-    data = {
-        'property_id': range(1, n_samples + 1),
-        'property_type': np.random.choice(property_types, n_samples),
-        'neighborhood': np.random.choice(neighborhoods, n_samples),
-        'price': np.random.normal(5000, 2000, n_samples),  # Indian pricing in INR
-        'bedrooms': np.random.choice([1, 2, 3, 4, 5], n_samples),
-        'bathrooms': np.random.choice([1, 1.5, 2, 2.5, 3, 3.5, 4], n_samples),
-        'rating': np.random.uniform(3.5, 5, n_samples),
-        'occupancy_rate': np.random.uniform(0.4, 0.9, n_samples),
-        'reviews_count': np.random.randint(10, 500, n_samples)
-    }
-
-    df = pd.DataFrame(data)
-    # Ensure reasonable price ranges
-    df.loc[df['price'] < 1000, 'price'] = 1000
-    return df
-
-def generate_seasonal_data():
-    dates = pd.date_range(start='2023-01-01', end='2023-12-31', freq='D')
-    n_days = len(dates)
-
-    # Base price with seasonal variations
-    base_price = 5000  # Base price in INR
-
-    # Seasonal factors
-    season_factor = np.sin(np.linspace(0, 2*np.pi, n_days)) * 1000
-
-    # Festival factors (major Indian festivals)
-    festival_dates = {
-        'Diwali': '2023-11-12',
-        'Holi': '2023-03-08',
-        'New Year': '2023-12-31',
-        'Dussehra': '2023-10-24'
-    }
-
-    festival_factor = np.zeros(n_days)
-    for date in dates:
-        for festival_date in festival_dates.values():
-            festival = pd.to_datetime(festival_date)
-            if abs((date - festival).days) <= 5:  # 5 days around festival
-                festival_factor[dates.get_loc(date)] = 2000
+from utils.amenities import generate_amenity_bits
+
+PROPERTY_TYPES = ['Apartment', 'Villa', 'Bungalow', 'Farmhouse', 'Heritage Home', 'Studio']
+NEIGHBORHOODS = ['South Delhi', 'Bandra West', 'Koramangala', 'Jubilee Hills', 'Boat Club Road']
+
+# Synthetic listings go live at some point in the two years up to this date
+LISTINGS_AS_OF = np.datetime64('2024-12-31')
+
+BEDROOMS = np.array([1, 2, 3, 4, 5])
+BATHROOMS = np.array([1, 1.5, 2, 2.5, 3, 3.5, 4])
+
+# Narrow dtypes for the compact (streaming) layout
+COMPACT_DTYPES = {
+    'price': np.float32,
+    'bedrooms': np.uint8,
+    'bathrooms': np.float32,
+    'rating': np.float32,
+    'occupancy_rate': np.float32,
+    'reviews_count': np.uint16
+}
+
+def _labels(codes, labels, compact):
+    if compact:
+        return pd.Categorical.from_codes(codes.astype(np.int8), labels)
+    return np.array(labels)[codes]
+
+def _listings_chunk(rng, start_id, n_rows, compact=False):
+    # The one definition of the listings schema and its distributions; label
+    # and choice columns draw indices, as rng.choice does, and compact only
+    # narrows dtypes, so both layouts hold the same values for a given rng
+    def index(options):
+        return rng.integers(0, len(options), n_rows)
+
+    df = pd.DataFrame({
+        'property_id': np.arange(start_id, start_id + n_rows, dtype=np.uint32 if compact else np.int64),
+        'property_type': _labels(index(PROPERTY_TYPES), PROPERTY_TYPES, compact),
+        'neighborhood': _labels(index(NEIGHBORHOODS), NEIGHBORHOODS, compact),
+        # Indian pricing in INR, with a floor for reasonable price ranges
+        'price': np.maximum(rng.normal(5000, 2000, n_rows), 1000),
+        'bedrooms': BEDROOMS[index(BEDROOMS)],
+        'bathrooms': BATHROOMS[index(BATHROOMS)],
+        'rating': rng.uniform(3.5, 5, n_rows),
+        'occupancy_rate': rng.uniform(0.4, 0.9, n_rows),
+        'reviews_count': rng.integers(10, 500, n_rows),
+        'amenity_bits': generate_amenity_bits(rng, n_rows),
+        'listed_date': LISTINGS_AS_OF - rng.integers(0, 730, n_rows).astype('timedelta64[D]')
+    })
+    return df.astype(COMPACT_DTYPES) if compact else df
+
+def generate_listings_data(n_samples=100, seed=42, rng=None, compact=False):
+    # A private Generator per call keeps concurrent sessions from sharing state
+    rng = np.random.default_rng(seed) if rng is None else rng
+    return _listings_chunk(rng, 1, n_samples, compact)
+
+def iter_listings_chunks(n_samples, chunk_size=1_000_000, seed=42):
+    # Later chunks get their own child seed, so the output only depends on
+    # (seed, chunk_size) and never needs more than one chunk in memory. The
+    # first chunk uses the seed itself and matches generate_listings_data.
+    for index, start in enumerate(range(0, n_samples, chunk_size)):
+        seed_sequence = np.random.SeedSequence(seed, spawn_key=(index,) if index else ())
+        rng = np.random.default_rng(seed_sequence)
+        yield _listings_chunk(rng, start + 1, min(chunk_size, n_samples - start), compact=True)
+
+def write_listings_dataset(path, n_samples, chunk_size=1_000_000, seed=42,
+                           partition_cols=('neighborhood',)):
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    chunks = iter_listings_chunks(n_samples, chunk_size, seed)
+    first = next(chunks, None)
+    if first is None:
+        return
+    schema = pa.Schema.from_pandas(first, preserve_index=False)
+
+    def batches():
+        yield from pa.Table.from_pandas(first, schema=schema, preserve_index=False).to_batches()
+        for chunk in chunks:
+            yield from pa.Table.from_pandas(chunk, schema=schema, preserve_index=False).to_batches()
+
+    ds.write_dataset(
+        batches(),
+        path,
+        schema=schema,
+        format='parquet',
+        partitioning=list(partition_cols),
+        partitioning_flavor='hive',
+        existing_data_behavior='delete_matching'
+    )
+
+# Festival calendar (major Indian festivals). Dates given as 'MM-DD' recur every
+# year of the requested range; full 'YYYY-MM-DD' dates apply to that year only.
+FESTIVAL_CALENDAR = {
+    'Diwali': '11-12',
+    'Holi': '03-08',
+    'New Year': '12-31',
+    'Dussehra': '10-24'
+}
+
+FREQUENCIES = {'daily': 'D', 'hourly': 'h'}
+
+def _festival_days(festivals, first_year, last_year):
+    days = []
+    for dates in festivals.values():
+        for date in ([dates] if isinstance(dates, str) else dates):
+            if len(date) == 5:
+                # Include neighbouring years so windows crossing New Year are
+                # kept; years without the date (02-29) are skipped
+                month, day = (int(part) for part in date.split('-'))
+                years = np.arange(first_year - 1, last_year + 2) - 1970
+                month_start = years.astype('datetime64[Y]').astype('datetime64[M]') + (month - 1)
+                candidates = month_start.astype('datetime64[D]') + (day - 1)
+                days.append(candidates[candidates.astype('datetime64[M]') == month_start])
+            else:
+                days.append(np.array([date], dtype='datetime64[D]'))
+    if not days:
+        return np.array([], dtype='datetime64[D]')
+    return np.unique(np.concatenate(days))
+
+def _festival_mask(days, festival_days, window=5):
+    # Interval mask: +1 at each window start, -1 past each window end, then a
+    # running sum over the (sorted) timeline tells whether a day is covered.
+    starts = np.searchsorted(days, festival_days - np.timedelta64(window, 'D'), side='left')
+    ends = np.searchsorted(days, festival_days + np.timedelta64(window, 'D'), side='right')
+    coverage = np.zeros(len(days) + 1, dtype=np.int32)
+    np.add.at(coverage, starts, 1)
+    np.add.at(coverage, ends, -1)
+    return np.cumsum(coverage[:-1]) > 0
+
+def festival_window_mask(dates, festivals=None, window=5):
+    # True for timestamps within `window` days of a festival in the calendar
+    dates = pd.DatetimeIndex(dates)
+    if not len(dates):
+        return np.zeros(0, dtype=bool)
+    days = dates.values.astype('datetime64[D]')
+    order = np.argsort(days, kind='stable')
+    festival_days = _festival_days(
+        FESTIVAL_CALENDAR if festivals is None else festivals,
+        dates.min().year,
+        dates.max().year
+    )
+    mask = np.empty(len(days), dtype=bool)
+    mask[order] = _festival_mask(days[order], festival_days, window)
+    return mask
+
+def generate_seasonal_data(start='2023-01-01', end='2023-12-31', freq='daily',
+                           neighborhoods=None, festivals=None, base_price=5000,
+                           seed=42, rng=None):
+    rng = np.random.default_rng(seed) if rng is None else rng
+    dates = pd.date_range(start=start, end=end, freq=FREQUENCIES.get(freq, freq))
+    n_steps = len(dates)
+
+    # Seasonal factors: one sine cycle per calendar year
+    timestamps = dates.values
+    year_start = timestamps.astype('datetime64[Y]')
+    year_end = year_start + np.timedelta64(1, 'Y')
+    year_start = year_start.astype('datetime64[ns]')
+    year_days = (year_end.astype('datetime64[ns]') - year_start) / np.timedelta64(1, 'D')
+    elapsed_days = (timestamps - year_start) / np.timedelta64(1, 'D')
+    season_factor = np.sin(2 * np.pi * elapsed_days / (year_days - 1)) * 1000
+
+    # Festival factors: +2000 within 5 days of any festival
+    festival_factor = np.where(festival_window_mask(dates, festivals), 2000, 0)
 
     # Weekend factor
-    weekend_factor = [1500 if d.weekday() >= 5 else 0 for d in dates]
-
-    data = {
-        'date': dates,
-        'price': base_price + season_factor + festival_factor + weekend_factor + np.random.normal(0, 500, n_days)
-    }
-
-    return pd.DataFrame(data)
-
-def generate_competitor_data(n_samples=20):
-    platforms = ['Airbnb', 'OYO', 'MakeMyTrip', 'Booking.com', 'Goibibo', 'Agoda']
-    data = []
-
-    platform_factors = {
-        'Airbnb': {'base': 5000, 'std': 1000},
-        'OYO': {'base': 3500, 'std': 800},
-        'MakeMyTrip': {'base': 4500, 'std': 900},
-        'Booking.com': {'base': 5500, 'std': 1200},
-        'Goibibo': {'base': 4000, 'std': 850},
-        'Agoda': {'base': 4800, 'std': 1000}
-    }
-
-    for platform in platforms:
-        base_price = platform_factors[platform]['base']
-        std = platform_factors[platform]['std']
-        prices = np.random.normal(base_price, std, n_samples)
-
-        for price in prices:
-            data.append({
-                'platform': platform,
-                'price': max(1000, price),  # Ensure minimum price
-                'rating': np.random.uniform(3.5, 5),
-                'reviews': np.random.randint(10, 1000)
-            })
-
-    return pd.DataFrame(data)
\ No newline at end of file
+    weekend_factor = np.where(dates.dayofweek >= 5, 1500, 0)
+
+    price = season_factor + festival_factor + weekend_factor
+
+    if neighborhoods is None:
+        return pd.DataFrame({
+            'date': dates,
+            'price': base_price + price + rng.normal(0, 500, n_steps)
+        })
+
+    neighborhoods = list(neighborhoods)
+    if isinstance(base_price, dict):
+        base = np.array([base_price[n] for n in neighborhoods], dtype=float)
+    else:
+        base = np.full(len(neighborhoods), base_price, dtype=float)
+    prices = base[:, None] + price + rng.normal(0, 500, (len(neighborhoods), n_steps))
+
+    return pd.DataFrame({
+        'date': np.tile(dates, len(neighborhoods)),
+        'neighborhood': pd.Categorical.from_codes(
+            np.repeat(np.arange(len(neighborhoods)), n_steps), neighborhoods
+        ),
+        'price': prices.ravel()
+    })
+
+PLATFORM_FACTORS = {
+    'Airbnb': {'base': 5000, 'std': 1000},
+    'OYO': {'base': 3500, 'std': 800},
+    'MakeMyTrip': {'base': 4500, 'std': 900},
+    'Booking.com': {'base': 5500, 'std': 1200},
+    'Goibibo': {'base': 4000, 'std': 850},
+    'Agoda': {'base': 4800, 'std': 1000}
+}
+
+def _label_column(codes, labels, dtype):
+    if dtype == 'category':
+        return pd.Categorical.from_codes(codes, labels)
+    if dtype == 'arrow':
+        import pyarrow as pa
+        return pd.arrays.ArrowExtensionArray(
+            pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int8()), pa.array(labels))
+        )
+    return np.array(labels, dtype=object)[codes]
+
+def generate_competitor_data(n_samples=20, label_dtype='object', seed=42, rng=None):
+    rng = np.random.default_rng(seed) if rng is None else rng
+    platforms = list(PLATFORM_FACTORS)
+    codes = np.repeat(np.arange(len(platforms), dtype=np.int8), n_samples)
+    n_rows = len(codes)
+
+    # Every platform's prices are drawn in one batch from per-row parameters
+    base = np.array([PLATFORM_FACTORS[p]['base'] for p in platforms], dtype=float)
+    std = np.array([PLATFORM_FACTORS[p]['std'] for p in platforms], dtype=float)
+    prices = rng.normal(base[codes], std[codes])
+
+    # label_dtype applies to every label column: platform, property_type, neighborhood
+    return pd.DataFrame({
+        'platform': _label_column(codes, platforms, label_dtype),
+        'price': np.maximum(prices, 1000),  # Ensure minimum price
+        'rating': rng.uniform(3.5, 5, n_rows),
+        'reviews': rng.integers(10, 1000, n_rows),
+        'property_type': _label_column(
+            rng.integers(0, len(PROPERTY_TYPES), n_rows, dtype=np.int8), PROPERTY_TYPES, label_dtype
+        ),
+        'neighborhood': _label_column(
+            rng.integers(0, len(NEIGHBORHOODS), n_rows, dtype=np.int8), NEIGHBORHOODS, label_dtype
+        ),
+        'bedrooms': rng.integers(1, 6, n_rows)
+    })
@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from utils.data_generator import (
+    generate_listings_data,
+    generate_seasonal_data,
+    generate_competitor_data
+)
+from utils.filter_index import ListingsFilterIndex
+from utils.visualization import PriceHistogram
+from utils.recommender import PriceRecommender
+from utils.market_rank import MarketRanker
+from utils.aggregates import MetricStore
+from utils.aggregate_cube import AggregateCube
+from utils.timeseries import SeasonalRollupStore
+from utils.anomalies import detect_anomalies
+from utils.forecasting import fit_seasonal_models
+from utils.ingest import ingest_listings_csv
+from utils.dataset_store import DatasetStore
+
+# Latest ingest report per listing file, for the Admin page
+ingest_reports = {}
+
+def _ingest_listings(source, mtime):
+    listings, report = ingest_listings_csv(source)
+    ingest_reports[source] = report
+    return listings, report
+
+# Base tables persisted in the memory-mapped store, so a restarted process
+# maps them from disk instead of regenerating or re-ingesting. Builders may
+# return (frame, metadata); the metadata is kept in the manifest entry.
+STORED_DATASETS = {
+    'listings': generate_listings_data,
+    'listings_csv': _ingest_listings,
+    'seasonal': generate_seasonal_data,
+    'competitor': generate_competitor_data
+}
+
+# An empty DATASET_STORE_DIR disables the store
+_store_dir = os.environ.get("DATASET_STORE_DIR", ".dataset_store")
+dataset_store = DatasetStore(_store_dir) if _store_dir else None
+
+def _build_stored(name, **params):
+    result = STORED_DATASETS[name](**params)
+    return result if isinstance(result, tuple) else (result, None)
+
+def _load_stored(name, **params):
+    if dataset_store is None:
+        return _build_stored(name, **params)[0]
+    df = dataset_store.read(name, **params)
+    if df is None:
+        df, metadata = _build_stored(name, **params)
+        dataset_store.write(name, df, metadata, **params)
+    return df
+
+def ingest_report():
+    # Report of the configured LISTINGS_CSV, from this process or the store
+    path = os.environ.get("LISTINGS_CSV")
+    if not path:
+        return None
+    if path in ingest_reports:
+        return ingest_reports[path]
+    for entry in dataset_store.entries() if dataset_store is not None else []:
+        if entry['dataset'] == 'listings_csv' and entry['params'].get('source') == path:
+            return entry.get('metadata')
+    return None
+
+def refresh_stored_datasets():
+    # Rebuilds every stored table; readers switch over on the manifest swap
+    if dataset_store is None:
+        return []
+    refreshed = []
+    for entry in dataset_store.entries():
+        if entry['dataset'] in STORED_DATASETS:
+            df, metadata = _build_stored(entry['dataset'], **entry['params'])
+            refreshed.append(dataset_store.write(entry['dataset'], df, metadata, **entry['params']))
+    dataset_cache.clear()
+    return refreshed
+
+def _load_listings(**params):
+    # A real listing dump, when configured, replaces the synthetic listings
+    path = os.environ.get("LISTINGS_CSV")
+    if path:
+        return _load_stored('listings_csv', source=path, mtime=os.path.getmtime(path))
+    return _load_stored('listings', **params)
+
+def _build_metric_store(listings):
+    store = MetricStore()
+    store.add_listings(listings)
+    return store
+
+DATASETS = {
+    'listings': _load_listings,
+    'seasonal': lambda **params: _load_stored('seasonal', **params),
+    'competitor': lambda **params: _load_stored('competitor', **params),
+    'listings_index': lambda **params: ListingsFilterIndex(get_dataset('listings', **params)),
+    'price_histogram': lambda **params: PriceHistogram.from_index(get_dataset('listings_index', **params)),
+    'price_recommender': lambda **params: PriceRecommender(get_dataset('listings', **params)),
+    'market_ranker': lambda **params: MarketRanker(get_dataset('listings', **params)),
+    'metric_store': lambda **params: _build_metric_store(get_dataset('listings', **params)),
+    'competitor_cube': lambda **params: AggregateCube(get_dataset('competitor', **params)),
+    'seasonal_rollups': lambda **params: SeasonalRollupStore(get_dataset('seasonal', **params)),
+    'seasonal_anomalies': lambda **params: detect_anomalies(get_dataset('seasonal', **params)),
+    'seasonal_model': lambda **params: fit_seasonal_models(get_dataset('seasonal', **params))
+}
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _sizeof(data):
+    if hasattr(data, 'memory_usage'):
+        return int(data.memory_usage(deep=True).sum())
+    return int(getattr(data, 'nbytes', 0))
+
+class DatasetCache:
+    def __init__(self, ttl=3600, max_bytes=512 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, name, **params):
+        key = (name, _freeze(params))
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry['created'] <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry['data']
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+
+        # Build outside the lock so a slow generator does not block other sessions
+        data = DATASETS[name](**params)
+        size = _sizeof(data)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = {'data': data, 'size': size, 'created': now}
+            self.total_bytes += size
+            # Evict least recently used entries, but always keep the newest one
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return data
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry['size']
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'entries': [
+                    {
+                        'dataset': key[0],
+                        'params': dict(key[1]),
+                        'size_bytes': entry['size'],
+                        'age_seconds': now - entry['created']
+                    }
+                    for key, entry in self._entries.items()
+                ],
+                'total_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+# Process-wide cache shared by every Streamlit session. Cached frames are
+# shared between reruns, so callers must treat them as read-only.
+dataset_cache = DatasetCache(
+    ttl=float(os.environ.get("DATASET_CACHE_TTL", 3600)),
+    max_bytes=int(os.environ.get("DATASET_CACHE_MAX_MB", 512)) * 1024 * 1024
+)
+
+def get_dataset(name, **params):
+    return dataset_cache.get(name, **params)
@@ -0,0 +1,113 @@
+import fcntl
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+MANIFEST = 'manifest.json'
+
+def _readable(df):
+    # pandas cannot rebuild Arrow dictionary extension columns from the
+    # stored metadata, so they are written as the equivalent categoricals
+    dictionaries = [
+        column for column, dtype in df.dtypes.items()
+        if isinstance(dtype, pd.ArrowDtype) and pa.types.is_dictionary(dtype.pyarrow_dtype)
+    ]
+    return df.astype({column: 'category' for column in dictionaries}) if dictionaries else df
+
+def _params_key(params):
+    encoded = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()[:12]
+
+class DatasetStore:
+    # Arrow IPC (Feather v2) files opened with memory mapping. Every Streamlit
+    # process on the host maps the same files, so the data lives once in the
+    # page cache instead of once per process. manifest.json records the
+    # current file of each (dataset, params) entry; writers publish a new
+    # version with os.replace so readers always see a complete file.
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, filename):
+        return os.path.join(self.root, filename)
+
+    @contextmanager
+    def _locked(self):
+        # Serializes manifest updates between processes
+        with open(self._path('manifest.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def manifest(self):
+        try:
+            with open(self._path(MANIFEST)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_manifest(self, manifest):
+        tmp = self._path(f'{MANIFEST}.{os.getpid()}.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self._path(MANIFEST))
+
+    def read(self, name, **params):
+        entry = self.manifest().get(f'{name}-{_params_key(params)}')
+        if entry is None:
+            return None
+        try:
+            source = pa.memory_map(self._path(entry['file']), 'r')
+        except FileNotFoundError:
+            return None
+        table = ipc.open_file(source).read_all()
+        # split_blocks keeps each column as its own block, so fixed-width
+        # columns without nulls stay views onto the mapped file
+        return table.to_pandas(split_blocks=True)
+
+    def write(self, name, df, metadata=None, **params):
+        key = f'{name}-{_params_key(params)}'
+        table = pa.Table.from_pandas(_readable(df), preserve_index=False)
+
+        with self._locked():
+            manifest = self.manifest()
+            previous = manifest.get(key)
+            version = previous['version'] + 1 if previous else 1
+            filename = f'{key}-v{version}.arrow'
+
+            # Uncompressed, so the file can be mapped without decoding
+            tmp = self._path(f'{filename}.tmp')
+            with ipc.new_file(tmp, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp, self._path(filename))
+
+            manifest[key] = {
+                'dataset': name,
+                'params': json.loads(json.dumps(params, default=str)),
+                'version': version,
+                'file': filename,
+                'rows': table.num_rows,
+                'bytes': os.path.getsize(self._path(filename)),
+                'updated': time.time(),
+                'metadata': json.loads(json.dumps(metadata, default=str)) if metadata else None
+            }
+            self._write_manifest(manifest)
+
+            # Processes still mapping the old version keep their pages
+            # after the unlink until they release the mapping
+            if previous:
+                try:
+                    os.remove(self._path(previous['file']))
+                except FileNotFoundError:
+                    pass
+        return manifest[key]
+
+    def entries(self):
+        return list(self.manifest().values())
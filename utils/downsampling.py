@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return x.astype(float)
+
+def lttb(x, y, n_out):
+    # Largest-triangle-three-buckets. y may be 2D (series x points) when all
+    # series share the same x, which runs every series in the same pass.
+    x = _as_float(x)
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    n_series, n = y.shape
+    if n_out >= n or n_out < 3:
+        return np.tile(np.arange(n), (n_series, 1))
+
+    edges = (np.floor(np.arange(n_out - 1) * (n - 2) / (n_out - 2)) + 1).astype(np.int64)
+    edges[-1] = n - 1
+    rows = np.arange(n_series)
+    selected = np.empty((n_series, n_out), dtype=np.int64)
+    selected[:, 0] = 0
+    selected[:, -1] = n - 1
+
+    a = np.zeros(n_series, dtype=np.int64)
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[:, next_start:next_end].mean(axis=1)
+
+        ax, ay = x[a], y[rows, a]
+        area = np.abs(
+            (ax - avg_x)[:, None] * (y[:, start:end] - ay[:, None])
+            - (ax[:, None] - x[start:end]) * (avg_y - ay)[:, None]
+        )
+        a = start + area.argmax(axis=1)
+        selected[:, i + 1] = a
+    return selected
+
+def minmax_downsample(x, y, n_out):
+    # Keeps the min and max of each bucket (plus both end points), so spikes
+    # survive at any zoom level
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    n_series, n = y.shape
+    n_buckets = max((n_out - 2) // 2, 1)
+    if n_out >= n or n < 4:
+        return np.tile(np.arange(n), (n_series, 1))
+
+    size = int(np.ceil((n - 2) / n_buckets))
+    padded = np.pad(y[:, 1:n - 1], ((0, 0), (0, n_buckets * size - (n - 2))), mode='edge')
+    buckets = padded.reshape(n_series, n_buckets, size)
+    offsets = 1 + np.arange(n_buckets) * size
+    lows = np.minimum(offsets + buckets.argmin(axis=2), n - 2)
+    highs = np.minimum(offsets + buckets.argmax(axis=2), n - 2)
+
+    selected = np.sort(np.concatenate([lows, highs], axis=1), axis=1)
+    first = np.zeros((n_series, 1), dtype=np.int64)
+    last = np.full((n_series, 1), n - 1, dtype=np.int64)
+    return np.concatenate([first, selected, last], axis=1)
+
+DOWNSAMPLERS = {
+    'lttb': lttb,
+    'minmax': minmax_downsample
+}
+
+def downsample_series(df, x='date', y='price', series=None, max_points=2000, method='lttb'):
+    downsample = DOWNSAMPLERS[method]
+    if series is None or series not in df.columns:
+        idx = downsample(df[x].to_numpy(), df[y].to_numpy(), max_points)[0]
+        return df.iloc[idx]
+
+    # Series sharing one timeline are stacked and downsampled together
+    wide = df.pivot(index=x, columns=series, values=y)
+    if not wide.isna().to_numpy().any():
+        values = wide.to_numpy().T
+        idx = downsample(wide.index.to_numpy(), values, max_points)
+        return pd.DataFrame({
+            x: wide.index.to_numpy()[idx].ravel(),
+            series: pd.Categorical(
+                np.repeat(wide.columns.to_numpy(), idx.shape[1]),
+                categories=wide.columns
+            ),
+            y: np.take_along_axis(values, idx, axis=1).ravel()
+        })
+
+    parts = []
+    for _, group in df.groupby(series, sort=False, observed=True):
+        idx = downsample(group[x].to_numpy(), group[y].to_numpy(), max_points)[0]
+        parts.append(group.iloc[idx])
+    return pd.concat(parts, ignore_index=True) if parts else df
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+class ListingsFilterIndex:
+    def __init__(self, df, columns=('property_type', 'neighborhood')):
+        self.frame = df
+        self.columns = tuple(columns)
+
+        codes = []
+        self.categories = {}
+        for column in self.columns:
+            values = pd.Categorical(df[column])
+            # Only values that actually occur become filter options
+            values = values.remove_unused_categories()
+            self.categories[column] = list(values.categories)
+            codes.append(values.codes.astype(np.int64))
+
+        self.shape = tuple(len(self.categories[c]) for c in self.columns)
+        cells = np.ravel_multi_index(codes, self.shape) if len(df) else np.zeros(0, dtype=np.int64)
+
+        # Row positions grouped by cell; cell i owns positions[offsets[i]:offsets[i + 1]]
+        self.positions = np.argsort(cells, kind='stable')
+        counts = np.bincount(cells, minlength=int(np.prod(self.shape)))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.cell_ids = cells
+
+    @property
+    def nbytes(self):
+        return self.positions.nbytes + self.offsets.nbytes + self.cell_ids.nbytes
+
+    def options(self, column):
+        return self.categories[column]
+
+    def counts(self):
+        return np.diff(self.offsets).reshape(self.shape)
+
+    def cells(self, **filters):
+        axes = []
+        for column in self.columns:
+            value = filters.get(column)
+            if value is None or value == "All":
+                axes.append(np.arange(len(self.categories[column])))
+            elif value in self.categories[column]:
+                axes.append(np.array([self.categories[column].index(value)]))
+            else:
+                return np.zeros(0, dtype=np.int64)
+        grid = np.meshgrid(*axes, indexing='ij')
+        return np.ravel_multi_index([axis.ravel() for axis in grid], self.shape)
+
+    def lookup(self, **filters):
+        if all(filters.get(c) in (None, "All") for c in self.columns):
+            return np.arange(len(self.frame))
+        cells = self.cells(**filters)
+        positions = np.concatenate(
+            [self.positions[self.offsets[c]:self.offsets[c + 1]] for c in cells]
+            or [np.zeros(0, dtype=np.int64)]
+        )
+        # Each cell is already in row order; merging several restores the
+        # data order a boolean filter would give
+        if len(cells) > 1:
+            positions.sort()
+        return positions
+
+    def select(self, **filters):
+        return self.frame.iloc[self.lookup(**filters)]
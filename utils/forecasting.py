@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+from utils.data_generator import festival_window_mask
+from utils.timeseries import series_matrix
+
+YEAR_DAYS = 365.25
+
+def seasonal_design_matrix(dates, origin, n_harmonics=4, festivals=None, window=5, trend=True):
+    # Intercept, optional linear trend, yearly Fourier terms, weekday dummies
+    # (Monday is the baseline) and the festival window indicator
+    dates = pd.DatetimeIndex(dates)
+    years = ((dates - pd.Timestamp(origin)) / pd.Timedelta(days=1)).to_numpy() / YEAR_DAYS
+    columns = [np.ones(len(dates))]
+    if trend:
+        columns.append(years)
+    for k in range(1, n_harmonics + 1):
+        columns.append(np.sin(2 * np.pi * k * years))
+        columns.append(np.cos(2 * np.pi * k * years))
+    weekday = dates.dayofweek.to_numpy()
+    columns.extend((weekday == day).astype(float) for day in range(1, 7))
+    columns.append(festival_window_mask(dates, festivals, window).astype(float))
+    return np.column_stack(columns)
+
+def fit_seasonal_models(seasonal, n_harmonics=4, festivals=None, window=5):
+    dates, Y, series, keys = series_matrix(seasonal)
+    # The trend is only identifiable once the history covers a few cycles
+    trend = (dates[-1] - dates[0]) >= pd.Timedelta(days=2 * 365)
+    X = seasonal_design_matrix(dates, dates[0], n_harmonics, festivals, window, trend)
+
+    # Every series shares the design matrix, so one lstsq call fits them all;
+    # days missing for any series are left out of the fit
+    complete = ~np.isnan(Y).any(axis=1)
+    coefficients, _, _, _ = np.linalg.lstsq(X[complete], Y[complete], rcond=None)
+    residuals = Y[complete] - X[complete] @ coefficients
+    dof = max(complete.sum() - X.shape[1], 1)
+
+    return {
+        'series': series,
+        'keys': keys,
+        'coefficients': coefficients,
+        'residual_std': np.sqrt((residuals ** 2).sum(axis=0) / dof),
+        'origin': dates[0],
+        'last_date': dates[-1],
+        'trend': trend,
+        'n_harmonics': n_harmonics,
+        'festivals': festivals,
+        'window': window
+    }
+
+def forecast_prices(model, horizon_days=90, interval=1.96):
+    # Daily forecast for every series of a fitted model past the last
+    # observed date, in the same long layout as generate_seasonal_data plus
+    # a prediction band; only evaluates X @ coefficients
+    dates = pd.date_range(model['last_date'] + pd.Timedelta(days=1), periods=horizon_days, freq='D')
+    X = seasonal_design_matrix(
+        dates, model['origin'], model['n_harmonics'], model['festivals'], model['window'], model['trend']
+    )
+    predicted = X @ model['coefficients']
+    spread = interval * model['residual_std']
+
+    n_series = len(model['keys'])
+    forecast = pd.DataFrame({'date': np.tile(dates, n_series)})
+    if len(model['series']) == 1:
+        keys = model['keys']
+        forecast[model['series'][0]] = pd.Categorical(np.repeat(keys, horizon_days), categories=keys)
+    else:
+        for i, column in enumerate(model['series']):
+            forecast[column] = pd.Categorical(np.repeat([key[i] for key in model['keys']], horizon_days))
+    forecast['price'] = predicted.T.ravel()
+    forecast['lower'] = (predicted - spread).T.ravel()
+    forecast['upper'] = (predicted + spread).T.ravel()
+    return forecast
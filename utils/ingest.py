@@ -0,0 +1,158 @@
+import time
+import numpy as np
+import pandas as pd
+from utils.amenities import AMENITY_VOCABULARY
+
+# Source column in public listing dumps (Inside Airbnb layout) for each column
+# of the generate_listings_data schema; everything else is never parsed
+LISTINGS_COLUMN_MAP = {
+    'property_id': 'id',
+    'property_type': 'property_type',
+    'neighborhood': 'neighbourhood_cleansed',
+    'price': 'price',
+    'bedrooms': 'bedrooms',
+    'bathrooms': 'bathrooms',
+    'rating': 'review_scores_rating',
+    'occupancy_rate': 'availability_365',
+    'reviews_count': 'number_of_reviews',
+    'amenity_bits': 'amenities',
+    'listed_date': 'first_review'
+}
+
+REQUIRED_COLUMNS = ['property_id', 'property_type', 'neighborhood', 'price']
+
+INT64_MAX = str(np.iinfo(np.int64).max)
+
+def _parse_price(values):
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+    return pd.to_numeric(values.astype(str).str.replace(r'[^0-9.\-]', '', regex=True), errors='coerce')
+
+def _parse_ids(values):
+    # Ids stay strings until they are known to be plain digits that fit in
+    # int64; going through float would round 17+ digit ids. Anything else
+    # becomes NaN and the row is dropped.
+    text = values.astype(str).str.strip().str.lstrip('0').replace('', '0')
+    digits = text.str.len()
+    valid = text.str.fullmatch(r'\d+', na=False) & (
+        (digits < len(INT64_MAX)) | ((digits == len(INT64_MAX)) & (text <= INT64_MAX))
+    )
+    return text.where(valid)
+
+def _encode_amenities(values, vocabulary=AMENITY_VOCABULARY):
+    # Amenity lists arrive as JSON-style arrays of quoted names; one vectorized
+    # substring scan per vocabulary entry, names outside it are ignored
+    text = values.fillna('').astype(str).str.lower()
+    present = np.column_stack([
+        text.str.contains(f'"{name.lower()}"', regex=False).to_numpy(dtype=bool)
+        for name in vocabulary.names
+    ]) if len(text) else np.zeros((0, len(vocabulary.names)), dtype=bool)
+    packed = vocabulary.pack(present)
+    return packed[:, 0] if vocabulary.n_words == 1 else list(packed)
+
+def _rss_mb(field='VmRSS'):
+    # Current (VmRSS) or peak (VmHWM) resident size; NaN off Linux
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float('nan')
+
+def _reset_peak_rss():
+    # Writing 5 to clear_refs resets VmHWM to the current RSS, so the next
+    # reading is the peak of the work done since
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+        return True
+    except OSError:
+        return False
+
+def clean_listings_chunk(raw, column_map=LISTINGS_COLUMN_MAP):
+    chunk = raw.rename(columns={source: target for target, source in column_map.items()})
+    n_rows = len(chunk)
+
+    def column(name, default=np.nan):
+        return chunk[name] if name in chunk.columns else pd.Series(default, index=chunk.index)
+
+    price = _parse_price(column('price'))
+    rating = pd.to_numeric(column('rating'), errors='coerce')
+    # Older dumps score reviews out of 100
+    rating = rating.where(rating <= 5, rating / 20)
+    availability = pd.to_numeric(column('occupancy_rate'), errors='coerce')
+
+    df = pd.DataFrame({
+        'property_id': _parse_ids(column('property_id')),
+        'property_type': column('property_type').astype('category'),
+        'neighborhood': column('neighborhood').astype('category'),
+        'price': price,
+        'bedrooms': pd.to_numeric(column('bedrooms'), errors='coerce'),
+        'bathrooms': pd.to_numeric(column('bathrooms'), errors='coerce'),
+        'rating': rating,
+        'occupancy_rate': 1 - availability / 365,
+        'reviews_count': pd.to_numeric(column('reviews_count'), errors='coerce'),
+        'listed_date': pd.to_datetime(column('listed_date', None), errors='coerce')
+    }, index=chunk.index)
+    df['amenity_bits'] = _encode_amenities(column('amenity_bits', None))
+
+    # Validation: required fields must parse; the rest are clipped or defaulted
+    valid = df[REQUIRED_COLUMNS].notna().all(axis=1) & (df['price'] > 0)
+    df = df.loc[valid].copy()
+    df['price'] = df['price'].clip(lower=1000).astype(np.float32)
+    df['bedrooms'] = df['bedrooms'].fillna(1).clip(0, 255).astype(np.uint8)
+    df['bathrooms'] = df['bathrooms'].fillna(1).astype(np.float32)
+    df['rating'] = df['rating'].clip(0, 5).astype(np.float32)
+    df['occupancy_rate'] = df['occupancy_rate'].clip(0, 1).astype(np.float32)
+    df['reviews_count'] = df['reviews_count'].fillna(0).clip(0, np.iinfo(np.uint16).max).astype(np.uint16)
+    df['property_id'] = df['property_id'].astype(np.int64)
+    return df, n_rows - len(df)
+
+def ingest_listings_csv(path, chunksize=200_000, column_map=LISTINGS_COLUMN_MAP):
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [source for source in column_map.values() if source in header]
+    missing = [t for t in REQUIRED_COLUMNS if column_map[t] not in header]
+    if missing:
+        raise ValueError(f"Listing file is missing columns for: {', '.join(missing)}")
+
+    # Peak memory of this ingest only: RSS growth over the starting point,
+    # from the reset high-water mark or, failing that, sampled per chunk
+    baseline = _rss_mb()
+    exact_peak = _reset_peak_rss()
+    sampled_peak = baseline
+
+    start = time.perf_counter()
+    chunks = []
+    rows_read = rows_dropped = 0
+    # Only the projected columns are parsed, all as strings, one chunk at a time
+    for raw in pd.read_csv(path, usecols=usecols, chunksize=chunksize, dtype=str):
+        cleaned, dropped = clean_listings_chunk(raw, column_map)
+        rows_read += len(raw)
+        rows_dropped += dropped
+        chunks.append(cleaned)
+        sampled_peak = max(sampled_peak, _rss_mb())
+
+    if chunks:
+        # Chunks carry their own categories; union them instead of decaying to object
+        for column in ('property_type', 'neighborhood'):
+            categories = pd.api.types.union_categoricals([c[column] for c in chunks]).categories
+            for chunk in chunks:
+                chunk[column] = pd.Categorical(chunk[column], categories=categories)
+        listings = pd.concat(chunks, ignore_index=True)
+    else:
+        listings = clean_listings_chunk(pd.DataFrame(columns=usecols), column_map)[0]
+    elapsed = time.perf_counter() - start
+    peak = (_rss_mb('VmHWM') if exact_peak else max(sampled_peak, _rss_mb())) - baseline
+
+    report = {
+        'rows_read': rows_read,
+        'rows_kept': len(listings),
+        'rows_dropped': rows_dropped,
+        'seconds': elapsed,
+        'rows_per_sec': rows_read / elapsed if elapsed else float('nan'),
+        'peak_memory_mb': peak,
+        'frame_memory_mb': float(listings.memory_usage(deep=True).sum()) / 1024**2
+    }
+    return listings, report
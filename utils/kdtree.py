@@ -0,0 +1,79 @@
+import heapq
+import numpy as np
+
+class KDTree:
+    # Array-backed KD-tree: points are reordered so every node owns a
+    # contiguous slice, and leaves are scanned with vectorized distances
+    def __init__(self, points, leaf_size=64):
+        self.points = np.ascontiguousarray(points, dtype=float)
+        n, self.dims = self.points.shape
+        self.order = np.arange(n)
+        self.leaf_size = leaf_size
+
+        # Per node: slice bounds, split dimension/value, children (-1 for leaves)
+        self.start, self.end, self.split_dim, self.split_value = [], [], [], []
+        self.left, self.right, self.lower, self.upper = [], [], [], []
+        if n:
+            self._build()
+        self.sorted_points = self.points[self.order]
+
+    def _add_node(self, start, end):
+        block = self.points[self.order[start:end]]
+        self.start.append(start)
+        self.end.append(end)
+        self.split_dim.append(-1)
+        self.split_value.append(0.0)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.lower.append(block.min(axis=0))
+        self.upper.append(block.max(axis=0))
+        return len(self.start) - 1
+
+    def _build(self):
+        stack = [self._add_node(0, len(self.points))]
+        while stack:
+            node = stack.pop()
+            start, end = self.start[node], self.end[node]
+            spread = self.upper[node] - self.lower[node]
+            if end - start <= self.leaf_size or not spread.any():
+                continue
+            dim = int(spread.argmax())
+            idx = self.order[start:end]
+            mid = (end - start) // 2
+            part = np.argpartition(self.points[idx, dim], mid)
+            self.order[start:end] = idx[part]
+            self.split_dim[node] = dim
+            self.split_value[node] = self.points[self.order[start + mid], dim]
+            self.left[node] = self._add_node(start, start + mid)
+            self.right[node] = self._add_node(start + mid, end)
+            stack.extend([self.left[node], self.right[node]])
+
+    def _box_distance(self, node, query):
+        gap = np.maximum(self.lower[node] - query, 0) + np.maximum(query - self.upper[node], 0)
+        return float(gap @ gap)
+
+    def query(self, query, k=1):
+        # Returns (distances, indices into the original points), nearest first
+        query = np.asarray(query, dtype=float)
+        if not len(self.start) or k <= 0:
+            return np.zeros(0), np.zeros(0, dtype=np.int64)
+
+        best_dist = np.full(0, np.inf)
+        best_idx = np.zeros(0, dtype=np.int64)
+        heap = [(self._box_distance(0, query), 0)]
+        while heap:
+            box_dist, node = heapq.heappop(heap)
+            if len(best_dist) == k and box_dist >= best_dist[-1]:
+                break
+            if self.left[node] == -1:
+                start, end = self.start[node], self.end[node]
+                diff = self.sorted_points[start:end] - query
+                dist = np.einsum('ij,ij->i', diff, diff)
+                best_dist = np.concatenate([best_dist, dist])
+                best_idx = np.concatenate([best_idx, self.order[start:end]])
+                keep = np.argsort(best_dist, kind='stable')[:k]
+                best_dist, best_idx = best_dist[keep], best_idx[keep]
+                continue
+            for child in (self.left[node], self.right[node]):
+                heapq.heappush(heap, (self._box_distance(child, query), child))
+        return np.sqrt(best_dist), best_idx
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+RANK_METRICS = ['price', 'rating', 'occupancy_rate', 'reviews_count']
+
+class MarketRanker:
+    # Pre-sorted metric arrays per (neighborhood, property_type) segment plus a
+    # market-wide segment, so a percentile is two binary searches. Missing
+    # values are left out, so each metric ranks only the listings that have it.
+    def __init__(self, listings, metrics=RANK_METRICS):
+        self.metrics = list(metrics)
+        self.segments = {}
+        self.add_listings(listings)
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for segment in self.segments.values() for values in segment.values())
+
+    def _merge(self, key, values):
+        segment = self.segments.setdefault(key, {})
+        for metric in self.metrics:
+            new = np.asarray(values[metric], dtype=float)
+            new = np.sort(new[np.isfinite(new)])
+            current = segment.get(metric)
+            if current is None or not len(current):
+                segment[metric] = new
+                continue
+            # Merge the sorted batch in: positions come from binary search,
+            # so no full re-sort of the segment
+            positions = np.searchsorted(current, new) + np.arange(len(new))
+            merged = np.empty(len(current) + len(new))
+            mask = np.zeros(len(merged), dtype=bool)
+            mask[positions] = True
+            merged[mask] = new
+            merged[~mask] = current
+            segment[metric] = merged
+
+    def add_listings(self, listings):
+        if not len(listings):
+            return
+        self._merge(('All', 'All'), listings)
+        for key, group in listings.groupby(['neighborhood', 'property_type'], observed=True):
+            self._merge(key, group)
+        for neighborhood, group in listings.groupby('neighborhood', observed=True):
+            self._merge((neighborhood, 'All'), group)
+        for property_type, group in listings.groupby('property_type', observed=True):
+            self._merge(('All', property_type), group)
+
+    def percentile(self, metric, value, neighborhood='All', property_type='All'):
+        # Share of the segment at or below `value` (ties count half)
+        values = self.segments.get((neighborhood, property_type), {}).get(metric)
+        if values is None or not len(values) or not np.isfinite(value):
+            return np.nan
+        below = np.searchsorted(values, value, side='left')
+        at_or_below = np.searchsorted(values, value, side='right')
+        return (below + at_or_below) / 2 / len(values) * 100
+
+    def segment_size(self, neighborhood='All', property_type='All', metric=None):
+        # Listings with a value for `metric` (the first metric by default)
+        values = self.segments.get((neighborhood, property_type), {}).get(metric or self.metrics[0])
+        return 0 if values is None else len(values)
+
+    def rank(self, listing, neighborhood='All', property_type='All'):
+        return pd.Series({
+            metric: self.percentile(metric, listing[metric], neighborhood, property_type)
+            for metric in self.metrics if metric in listing
+        })
@@ -0,0 +1,127 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+@lru_cache(maxsize=512)
+def _unit_schedule(annual_rate, years):
+    # Schedule of a loan of 1: every column scales linearly with the
+    # principal, so one entry per (rate, term) serves every loan size
+    n_months = int(round(years * 12))
+    r = annual_rate / 100 / 12
+    k = np.arange(1, n_months + 1)
+    if r == 0:
+        payment = 1 / n_months
+        balance = 1 - payment * k
+    else:
+        growth = (1 + r) ** k
+        payment = r / (1 - (1 + r) ** -n_months)
+        balance = growth - payment * (growth - 1) / r
+    balance = np.maximum(balance, 0)
+    previous = np.concatenate([[1.0], balance[:-1]])
+    schedule = {
+        'payment': np.full(n_months, payment),
+        'interest': previous * r,
+        'principal': previous - balance,
+        'balance': balance
+    }
+    # Shared between callers through the cache, so hand out read-only arrays
+    for values in schedule.values():
+        values.setflags(write=False)
+    return schedule
+
+def amortization_schedule(principal, annual_rate, years):
+    # principal may be a scalar or an array of loans with the same terms;
+    # each array gets a row per loan (loans x months)
+    unit = _unit_schedule(round(float(annual_rate), 4), float(years))
+    scale = np.asarray(principal, dtype=float)[..., None]
+    return {name: scale * values for name, values in unit.items()}
+
+def _npv(cash_flows, monthly_rate, derivative=False):
+    t = np.arange(cash_flows.shape[1])
+    discount = np.exp(-t * np.log1p(monthly_rate)[:, None])
+    npv = (cash_flows * discount).sum(axis=1)
+    if not derivative:
+        return npv
+    slope = -(cash_flows * t * discount).sum(axis=1) / (1 + monthly_rate)
+    return npv, slope
+
+def irr(cash_flows, low=-0.5, high=1.0, tol=1e-10, iterations=100):
+    # Monthly IRR for every row at once: Newton steps, falling back to
+    # bisection whenever a step leaves the bracket. NaN where the cash flows
+    # do not change sign within [low, high].
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    low = np.full(len(cash_flows), low)
+    high = np.full(len(cash_flows), high)
+    npv_low = _npv(cash_flows, low)
+    valid = np.sign(npv_low) != np.sign(_npv(cash_flows, high))
+
+    rate = np.full(len(cash_flows), 0.01)
+    last_step = high - low
+    for _ in range(iterations):
+        npv, slope = _npv(cash_flows, rate, derivative=True)
+        same = np.sign(npv) == np.sign(npv_low)
+        low = np.where(same, rate, low)
+        npv_low = np.where(same, npv, npv_low)
+        high = np.where(same, high, rate)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton = rate - npv / slope
+        # Only trust Newton when it stays in the bracket and at least halves
+        # the previous step; otherwise bisect
+        use_newton = (
+            np.isfinite(newton) & (newton > low) & (newton < high)
+            & (np.abs(newton - rate) < np.abs(last_step) / 2)
+        )
+        new_rate = np.where(use_newton, newton, (low + high) / 2)
+        last_step = new_rate - rate
+        rate = new_rate
+        if (np.abs(last_step)[valid] < tol).all():
+            break
+    return np.where(valid, rate, np.nan)
+
+def project_portfolio(properties, horizon_years=10, discount_rate=8):
+    # properties: DataFrame (or dict of equal-length arrays) with one row per
+    # property; every month of every property is computed as one array
+    props = pd.DataFrame(properties)
+    n_props = len(props)
+    n_months = int(horizon_years * 12)
+    years_elapsed = np.arange(n_months) // 12
+
+    purchase = props['purchase_price'].to_numpy(dtype=float)
+    loan = purchase * (1 - props['down_payment_pct'].to_numpy(dtype=float) / 100)
+    rent_growth = 1 + props['rent_growth'].to_numpy(dtype=float)[:, None] / 100
+    inflation = 1 + props['expense_inflation'].to_numpy(dtype=float)[:, None] / 100
+    revenue = props['monthly_revenue'].to_numpy(dtype=float)[:, None] * rent_growth ** years_elapsed
+    expenses = props['monthly_expenses'].to_numpy(dtype=float)[:, None] * inflation ** years_elapsed
+
+    # Mortgage payments come from one cached unit schedule per distinct
+    # (rate, term), scaled to every loan on those terms at once
+    mortgage = np.zeros((n_props, n_months))
+    balance_at_exit = np.zeros(n_props)
+    financed = np.maximum(loan, 0)
+    for (rate, years), rows in props.groupby(['interest_rate', 'loan_years']).indices.items():
+        schedule = amortization_schedule(financed[rows], rate, years)
+        covered = min(n_months, schedule['payment'].shape[1])
+        mortgage[rows, :covered] = schedule['payment'][:, :covered]
+        if n_months <= schedule['balance'].shape[1]:
+            balance_at_exit[rows] = schedule['balance'][:, n_months - 1]
+
+    appreciation = 1 + props['appreciation_rate'].to_numpy(dtype=float) / 100
+    sale_value = purchase * appreciation ** horizon_years
+
+    cash_flows = np.zeros((n_props, n_months + 1))
+    cash_flows[:, 0] = -(purchase - loan)
+    cash_flows[:, 1:] = revenue - expenses - mortgage
+    cash_flows[:, -1] += sale_value - balance_at_exit
+
+    monthly_discount = np.full(n_props, (1 + discount_rate / 100) ** (1 / 12) - 1)
+    monthly_irr = irr(cash_flows)
+
+    summary = pd.DataFrame({
+        'npv': _npv(cash_flows, monthly_discount),
+        'irr': ((1 + monthly_irr) ** 12 - 1) * 100,
+        'operating_cash_flow': cash_flows[:, 1:].sum(axis=1) - (sale_value - balance_at_exit),
+        'sale_value': sale_value,
+        'equity_at_exit': sale_value - balance_at_exit
+    }, index=props.index)
+    return summary, cash_flows
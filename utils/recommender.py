@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+from utils.data_generator import festival_window_mask
+from utils.kdtree import KDTree
+
+# Relative weight of each feature in the similarity metric; a different
+# neighborhood costs as much as two extra bedrooms
+FEATURE_WEIGHTS = {
+    'bedrooms': 1.0,
+    'bathrooms': 1.0,
+    'neighborhood': 2.0
+}
+
+class PriceRecommender:
+    # One KD-tree per property type. New listings go to a small buffer that is
+    # scanned brute-force, and a type's tree is rebuilt only once its buffer
+    # outgrows rebuild_fraction of the tree.
+    def __init__(self, listings, rebuild_fraction=0.1, min_rebuild=1000):
+        self.neighborhoods = sorted(listings['neighborhood'].unique())
+        self.rebuild_fraction = rebuild_fraction
+        self.min_rebuild = min_rebuild
+        self.partitions = {}
+        for property_type, group in listings.groupby('property_type', observed=True):
+            self.partitions[property_type] = {'frame': group, 'buffer': group.iloc[:0]}
+            self._rebuild(property_type)
+
+    @property
+    def nbytes(self):
+        return sum(p['tree'].sorted_points.nbytes for p in self.partitions.values())
+
+    def _features(self, bedrooms, bathrooms, neighborhoods):
+        codes = pd.Categorical(neighborhoods, categories=self.neighborhoods).codes
+        # Scaled one-hot: two different neighborhoods are `weight` apart. An
+        # unknown neighborhood (code -1) stays all-zero, so it never matches one.
+        one_hot = np.zeros((len(codes), len(self.neighborhoods)))
+        known = codes >= 0
+        one_hot[np.flatnonzero(known), codes[known]] = FEATURE_WEIGHTS['neighborhood'] / np.sqrt(2)
+        return np.column_stack([
+            np.asarray(bedrooms, dtype=float) * FEATURE_WEIGHTS['bedrooms'],
+            np.asarray(bathrooms, dtype=float) * FEATURE_WEIGHTS['bathrooms'],
+            one_hot
+        ])
+
+    def _frame_features(self, frame):
+        return self._features(frame['bedrooms'], frame['bathrooms'], frame['neighborhood'])
+
+    def _rebuild(self, property_type):
+        partition = self.partitions[property_type]
+        partition['frame'] = pd.concat([partition['frame'], partition['buffer']])
+        partition['buffer'] = partition['frame'].iloc[:0]
+        partition['tree'] = KDTree(self._frame_features(partition['frame']))
+        partition['buffer_points'] = np.zeros((0, partition['tree'].dims))
+
+    def add_listings(self, listings):
+        # New neighborhoods widen the one-hot features of every partition, so
+        # the vocabulary is extended and all trees are rebuilt first
+        new = sorted(set(listings['neighborhood'].unique()) - set(self.neighborhoods))
+        if new:
+            self.neighborhoods = self.neighborhoods + new
+            for property_type in self.partitions:
+                self._rebuild(property_type)
+
+        for property_type, group in listings.groupby('property_type', observed=True):
+            if property_type not in self.partitions:
+                self.partitions[property_type] = {'frame': group, 'buffer': group.iloc[:0]}
+                self._rebuild(property_type)
+                continue
+            partition = self.partitions[property_type]
+            partition['buffer'] = pd.concat([partition['buffer'], group])
+            partition['buffer_points'] = np.vstack([partition['buffer_points'], self._frame_features(group)])
+            threshold = max(self.min_rebuild, self.rebuild_fraction * len(partition['frame']))
+            if len(partition['buffer']) > threshold:
+                self._rebuild(property_type)
+
+    def comparables(self, property_type, bedrooms, bathrooms, neighborhood, k=25):
+        partition = self.partitions.get(property_type)
+        if partition is None:
+            return pd.DataFrame()
+        query = self._features([bedrooms], [bathrooms], [neighborhood])[0]
+
+        dist, idx = partition['tree'].query(query, k)
+        frame = partition['frame'].iloc[idx].assign(distance=dist)
+        if len(partition['buffer']):
+            diff = partition['buffer_points'] - query
+            buffer_dist = np.sqrt(np.einsum('ij,ij->i', diff, diff))
+            nearest = np.argsort(buffer_dist, kind='stable')[:k]
+            frame = pd.concat([frame, partition['buffer'].iloc[nearest].assign(distance=buffer_dist[nearest])])
+        return frame.sort_values('distance', kind='stable').head(k)
+
+def seasonal_uplifts(seasonal):
+    # Weekend and festival premiums relative to ordinary weekdays, measured
+    # from the seasonal price series
+    dates = pd.DatetimeIndex(seasonal['date'])
+    prices = seasonal['price'].to_numpy()
+    festival = festival_window_mask(dates)
+    weekend = np.asarray(dates.dayofweek >= 5)
+    ordinary = prices[~weekend & ~festival].mean()
+    return {
+        'weekend': prices[weekend & ~festival].mean() / ordinary - 1,
+        'festival': prices[festival].mean() / ordinary - 1
+    }
+
+def recommend_price(comparables, uplifts):
+    prices = comparables['price'].to_numpy()
+    base = np.percentile(prices, [25, 75]) if len(prices) else np.array([np.nan, np.nan])
+    return {
+        'base': tuple(base),
+        'weekend': tuple(base * (1 + uplifts['weekend'])),
+        'festival': tuple(base * (1 + uplifts['festival'])),
+        'weekend_uplift': uplifts['weekend'],
+        'festival_uplift': uplifts['festival'],
+        'n_comparables': len(prices)
+    }
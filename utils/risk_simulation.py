@@ -0,0 +1,150 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from utils.roi import calculate_roi, monthly_revenue
+
+# ROI histogram (in percentage points) shared by every batch of a run, so
+# batch results merge by adding counts and memory does not grow with
+# scenario count. Its range is sized per run from a pilot batch.
+ROI_BINS = 40000
+PILOT_SCENARIOS = 20_000
+
+DEFAULT_RISK_PARAMS = {
+    'purchase_price': 300000,
+    'nightly_rate': 150,
+    'nightly_rate_volatility': 0.15,  # lognormal sigma
+    'occupancy_rate': 70,
+    'occupancy_std': 10,
+    'monthly_expenses': 2600,
+    'expense_inflation_mean': 5,
+    'expense_inflation_std': 3,
+    'appreciation_mean': 3,
+    'appreciation_std': 4
+}
+
+def sample_scenarios(rng, n, params):
+    # Occupancy follows a beta distribution with the requested mean and spread
+    mean = np.clip(params['occupancy_rate'] / 100, 1e-3, 1 - 1e-3)
+    std = max(params['occupancy_std'] / 100, 1e-6)
+    concentration = max(mean * (1 - mean) / std**2 - 1, 1e-3)
+    occupancy = rng.beta(mean * concentration, (1 - mean) * concentration, n) * 100
+
+    nightly_rate = params['nightly_rate'] * rng.lognormal(0, params['nightly_rate_volatility'], n)
+    inflation = rng.normal(params['expense_inflation_mean'], params['expense_inflation_std'], n)
+    appreciation = rng.normal(params['appreciation_mean'], params['appreciation_std'], n)
+
+    return {
+        'occupancy_rate': occupancy,
+        'nightly_rate': nightly_rate,
+        'monthly_expenses': params['monthly_expenses'] * (1 + inflation / 100),
+        'appreciation_rate': appreciation
+    }
+
+def _simulate_roi(seed_sequence, n, params):
+    rng = np.random.default_rng(seed_sequence)
+    scenarios = sample_scenarios(rng, n, params)
+    roi, _, _ = calculate_roi(
+        params['purchase_price'],
+        monthly_revenue(scenarios['nightly_rate'], scenarios['occupancy_rate']),
+        scenarios['monthly_expenses'],
+        scenarios['appreciation_rate']
+    )
+    return roi
+
+def roi_edges(seed_sequence, params, n_bins=ROI_BINS):
+    # Pilot range widened by its own span on both sides; the tails of 10M
+    # scenarios rarely reach past it, and anything that does is counted
+    roi = _simulate_roi(seed_sequence, PILOT_SCENARIOS, params)
+    low, high = float(roi.min()), float(roi.max())
+    span = max(high - low, 1.0)
+    return np.linspace(low - span, high + span, n_bins + 1)
+
+def _simulate_batch(seed_sequence, n, params, edges):
+    roi = _simulate_roi(seed_sequence, n, params)
+    counts, _ = np.histogram(roi, bins=edges)
+    return {
+        'n': n,
+        'counts': counts,
+        'below': int((roi < edges[0]).sum()),
+        'above': int((roi > edges[-1]).sum()),
+        'sum': float(roi.sum()),
+        'losses': int((roi < 0).sum())
+    }
+
+def _percentile(counts, edges, q, below=0, above=0):
+    # Out-of-range scenarios still count towards the rank; a percentile that
+    # falls among them can only be bounded by the histogram edge
+    cumulative = below + np.cumsum(counts)
+    target = q / 100 * (cumulative[-1] + above)
+    if target <= below:
+        return edges[0]
+    if target > cumulative[-1]:
+        return edges[-1]
+    i = int(np.searchsorted(cumulative, target))
+    before = cumulative[i - 1] if i else below
+    fraction = (target - before) / counts[i] if counts[i] else 0.0
+    return edges[i] + fraction * (edges[i + 1] - edges[i])
+
+def summarize_simulation(counts, edges, n, total, losses, below=0, above=0):
+    # No scenarios means no distribution, so nothing to report but NaN
+    def percentile(q):
+        return _percentile(counts, edges, q, below, above) if n else float('nan')
+
+    return {
+        'n_scenarios': n,
+        'mean_roi': total / n if n else float('nan'),
+        'p5': percentile(5),
+        'p50': percentile(50),
+        'p95': percentile(95),
+        'probability_of_loss': losses / n if n else float('nan'),
+        'out_of_range': below + above,
+        'edges': edges,
+        'counts': counts
+    }
+
+def simulate_roi(params, n_scenarios=1_000_000, batch_size=250_000, n_workers=None,
+                 seed=42, progress=None):
+    # Each batch gets its own child stream, so results depend only on the
+    # seed and batch size, not on how batches land on workers
+    sizes = [batch_size] * (n_scenarios // batch_size)
+    if n_scenarios % batch_size:
+        sizes.append(n_scenarios % batch_size)
+    # The pilot takes the child stream after the batches', leaving theirs unchanged
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes) + 1)
+    edges = roi_edges(seeds.pop(), params)
+    n_workers = min(n_workers or os.cpu_count() or 1, len(sizes) or 1)
+
+    counts = np.zeros(len(edges) - 1, dtype=np.int64)
+    done = total = losses = below = above = 0
+
+    def merge(result):
+        nonlocal counts, done, total, losses, below, above
+        counts += result['counts']
+        done += result['n']
+        total += result['sum']
+        losses += result['losses']
+        below += result['below']
+        above += result['above']
+        if progress is not None:
+            progress(done, n_scenarios)
+
+    if n_workers == 1:
+        for seed_sequence, size in zip(seeds, sizes):
+            merge(_simulate_batch(seed_sequence, size, params, edges))
+    else:
+        # Called from Streamlit's threaded server, where forking the whole
+        # process can deadlock on locks held by other threads; workers start
+        # from a clean forkserver process instead
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context('forkserver')
+        ) as executor:
+            futures = [
+                executor.submit(_simulate_batch, seed_sequence, size, params, edges)
+                for seed_sequence, size in zip(seeds, sizes)
+            ]
+            for future in as_completed(futures):
+                merge(future.result())
+
+    return summarize_simulation(counts, edges, done, total, losses, below, above)
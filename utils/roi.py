@@ -0,0 +1,28 @@
+import numpy as np
+
+def monthly_revenue(nightly_rate, occupancy_rate, nights=30):
+    # occupancy_rate is a percentage, as entered on the ROI page
+    return np.asarray(nightly_rate, dtype=float) * nights * np.asarray(occupancy_rate, dtype=float) / 100
+
+def calculate_roi(purchase_price, monthly_revenue, monthly_expenses, appreciation_rate):
+    # Every argument may be a scalar or an array; results broadcast like numpy
+    purchase_price = np.asarray(purchase_price, dtype=float)
+    annual_revenue = np.asarray(monthly_revenue, dtype=float) * 12
+    annual_expenses = np.asarray(monthly_expenses, dtype=float) * 12
+    annual_profit = annual_revenue - annual_expenses
+
+    property_value_after_year = purchase_price * (1 + np.asarray(appreciation_rate, dtype=float)/100)
+    total_return = annual_profit + (property_value_after_year - purchase_price)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roi = (total_return / purchase_price) * 100
+    return roi, annual_profit, total_return
+
+def calculate_roi_grid(purchase_price, nightly_rates, occupancy_rates, monthly_expenses, appreciation_rate):
+    # ROI surface with occupancy along rows and nightly rate along columns,
+    # evaluated in a single broadcast call
+    nightly_rates = np.asarray(nightly_rates, dtype=float)
+    occupancy_rates = np.asarray(occupancy_rates, dtype=float)
+    revenue = monthly_revenue(nightly_rates[None, :], occupancy_rates[:, None])
+    roi, _, _ = calculate_roi(purchase_price, revenue, monthly_expenses, appreciation_rate)
+    return roi
@@ -0,0 +1,80 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from utils.data_generator import (
+    generate_listings_data,
+    generate_seasonal_data,
+    generate_competitor_data,
+    PLATFORM_FACTORS
+)
+
+def _split_listings(params, n_shards):
+    sizes = [len(part) for part in np.array_split(np.arange(params.get('n_samples', 100)), n_shards)]
+    return [dict(params, n_samples=size) for size in sizes]
+
+def _split_seasonal(params, n_shards):
+    neighborhoods = params.get('neighborhoods')
+    # A single series cannot be split without changing its noise stream
+    if neighborhoods is None:
+        return [params]
+    return [dict(params, neighborhoods=list(part))
+            for part in np.array_split(np.array(neighborhoods, dtype=object), n_shards)]
+
+def _split_competitor(params, n_shards):
+    sizes = [len(part) for part in np.array_split(np.arange(params.get('n_samples', 20)), n_shards)]
+    return [dict(params, n_samples=size) for size in sizes]
+
+def _merge_listings(shards):
+    df = pd.concat(shards, ignore_index=True)
+    df['property_id'] = np.arange(1, len(df) + 1)
+    return df
+
+def _merge_seasonal(shards):
+    df = pd.concat(shards, ignore_index=True)
+    if 'neighborhood' in df.columns:
+        categories = [n for shard in shards for n in shard['neighborhood'].cat.categories]
+        df['neighborhood'] = pd.Categorical(df['neighborhood'], categories=categories)
+    return df
+
+def _merge_competitor(shards):
+    df = pd.concat(shards, ignore_index=True)
+    # Restore the per-platform row grouping of the single-process generator
+    order = pd.Categorical(df['platform'], categories=list(PLATFORM_FACTORS)).codes
+    df = df.iloc[np.argsort(order, kind='stable')].reset_index(drop=True)
+    if isinstance(shards[0]['platform'].dtype, pd.CategoricalDtype):
+        df['platform'] = pd.Categorical(df['platform'], categories=list(PLATFORM_FACTORS))
+    return df
+
+GENERATORS = {
+    'listings': (generate_listings_data, _split_listings, _merge_listings),
+    'seasonal': (generate_seasonal_data, _split_seasonal, _merge_seasonal),
+    'competitor': (generate_competitor_data, _split_competitor, _merge_competitor)
+}
+
+def _build_shard(name, seed_sequence, params):
+    generator = GENERATORS[name][0]
+    return generator(rng=np.random.default_rng(seed_sequence), **params)
+
+def generate_sharded(name, seed=42, n_workers=None, **params):
+    if name not in GENERATORS:
+        raise ValueError(f"Unknown dataset: {name}")
+    n_workers = n_workers or os.cpu_count() or 1
+    _, split, merge = GENERATORS[name]
+
+    # One independent child stream per shard: the result depends only on
+    # (seed, n_workers), never on scheduling order
+    shard_params = split(params, n_workers)
+    seeds = np.random.SeedSequence(seed).spawn(len(shard_params))
+
+    if len(shard_params) == 1:
+        return merge([_build_shard(name, seeds[0], shard_params[0])])
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        shards = list(executor.map(
+            _build_shard,
+            [name] * len(shard_params),
+            seeds,
+            shard_params
+        ))
+    return merge(shards)
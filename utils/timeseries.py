@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+def _week_start(days):
+    # 1970-01-01 was a Thursday; weeks start on Monday
+    return days - (days.astype(np.int64) + 3) % 7
+
+def _quarter_start(days):
+    months = days.astype('datetime64[M]').astype(np.int64)
+    return (months - months % 3).astype('datetime64[M]')
+
+# Finest to coarsest: period start of each day, and the average period length
+RESOLUTIONS = {
+    'daily': (lambda days: days, 1.0),
+    'weekly': (_week_start, 7.0),
+    'monthly': (lambda days: days.astype('datetime64[M]'), 30.44),
+    'quarterly': (_quarter_start, 91.31)
+}
+
+# Partial aggregates kept per series and period, and how two partials combine
+ROLLUP_AGGREGATES = {
+    'count': ('price', 'size', 'sum'),
+    'price_sum': ('price', 'sum', 'sum'),
+    'price_min': ('price', 'min', 'min'),
+    'price_max': ('price', 'max', 'max')
+}
+
+SERIES_COLUMNS = ['neighborhood', 'property_type']
+
+def series_matrix(seasonal):
+    # Dates x series price matrix, scattered by factorized codes (much
+    # cheaper than pivot on categoricals); absent days stay NaN
+    series = [c for c in SERIES_COLUMNS if c in seasonal.columns]
+    date_codes, dates = pd.factorize(seasonal['date'], sort=True)
+    if not series:
+        series_codes, keys = np.zeros(len(seasonal), dtype=np.intp), [None]
+    elif len(series) == 1:
+        series_codes, keys = pd.factorize(seasonal[series[0]])
+    else:
+        series_codes, keys = pd.MultiIndex.from_frame(seasonal[series]).factorize()
+    Y = np.full((len(dates), len(keys)), np.nan)
+    Y[date_codes, series_codes] = seasonal['price'].to_numpy(dtype=float)
+    return pd.DatetimeIndex(dates), Y, series, list(keys)
+
+class SeasonalRollupStore:
+    # Daily, weekly, monthly and quarterly rollups of seasonal prices per
+    # neighborhood / property type series. Appends only touch the periods
+    # they fall into, and long windows are answered from coarse rollups
+    # without reading the daily rows again.
+    def __init__(self, seasonal=None, series=None):
+        self.series = series
+        self.rollups = {}
+        if seasonal is not None:
+            self.append(seasonal)
+
+    @property
+    def nbytes(self):
+        return int(sum(r.memory_usage(deep=True).sum() for r in self.rollups.values()))
+
+    def _aggregate(self, seasonal, resolution):
+        period_start, _ = RESOLUTIONS[resolution]
+        days = seasonal['date'].to_numpy().astype('datetime64[D]')
+        keys = [seasonal[column] for column in self.series]
+        keys.append(pd.Series(period_start(days).astype('datetime64[ns]'), index=seasonal.index, name='date'))
+        return seasonal.groupby(keys, observed=True).agg(**{
+            name: (column, how) for name, (column, how, _) in ROLLUP_AGGREGATES.items()
+        })
+
+    def append(self, seasonal):
+        if self.series is None:
+            self.series = [c for c in SERIES_COLUMNS if c in seasonal.columns]
+        for resolution in RESOLUTIONS:
+            new = self._aggregate(seasonal, resolution)
+            current = self.rollups.get(resolution)
+            if current is None or current.empty:
+                self.rollups[resolution] = new
+                continue
+            # Only periods present in both need combining; the rest is concatenated
+            overlap = new.index.isin(current.index)
+            if overlap.any():
+                touched = current.index.isin(new.index[overlap])
+                combined = pd.concat([current[touched], new[overlap]]).groupby(
+                    level=list(range(new.index.nlevels)), observed=True
+                ).agg({name: combine for name, (_, _, combine) in ROLLUP_AGGREGATES.items()})
+                current = pd.concat([current[~touched], combined])
+            self.rollups[resolution] = pd.concat([current, new[~overlap]]).sort_index()
+
+    def span(self):
+        dates = self.rollups['daily'].index.get_level_values('date')
+        return dates.min(), dates.max()
+
+    def resolution_for(self, start, end, max_points=None):
+        # Finest resolution whose periods in the window fit the point budget
+        if max_points is None:
+            return 'daily'
+        days = (pd.Timestamp(end) - pd.Timestamp(start)) / pd.Timedelta(days=1) + 1
+        for resolution, (_, period_days) in RESOLUTIONS.items():
+            if days / period_days <= max_points:
+                return resolution
+        return list(RESOLUTIONS)[-1]
+
+    def query(self, start=None, end=None, max_points=None, resolution=None, **filters):
+        first_day, last_day = self.span()
+        start = pd.Timestamp(start) if start is not None else first_day
+        end = pd.Timestamp(end) if end is not None else last_day
+        resolution = resolution or self.resolution_for(start, end, max_points)
+
+        rollup = self.rollups[resolution].reset_index()
+        for column, value in filters.items():
+            if value is not None and value != "All":
+                rollup = rollup[rollup[column] == value]
+        # Periods overlapping the window; a partial first period starts before it
+        period_start, _ = RESOLUTIONS[resolution]
+        first = period_start(np.array([start.to_datetime64()], dtype='datetime64[D]'))[0]
+        rollup = rollup[(rollup['date'] >= pd.Timestamp(first)) & (rollup['date'] <= end)]
+
+        result = pd.DataFrame({
+            **{column: rollup[column] for column in self.series + ['date']},
+            'price': rollup['price_sum'] / rollup['count'],
+            'price_min': rollup['price_min'],
+            'price_max': rollup['price_max'],
+            'count': rollup['count']
+        }).reset_index(drop=True)
+        result.attrs['resolution'] = resolution
+        return result
@@ -1,12 +1,89 @@
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
+from utils.downsampling import downsample_series
+
+class PriceHistogram:
+    # Fixed bin edges over the whole dataset, with counts kept per filter-index
+    # cell so any filter combination is a sum of precomputed rows
+    def __init__(self, prices, cells=None, n_cells=1, nbins=30, value_range=None):
+        prices = np.asarray(prices, dtype=float)
+        if value_range is None:
+            value_range = (prices.min(), prices.max()) if len(prices) else (0.0, 1.0)
+        self.edges = np.linspace(value_range[0], value_range[1], nbins + 1)
+        self.nbins = nbins
+        self.cell_counts = np.zeros((n_cells, nbins), dtype=np.int64)
+        self.add(prices, cells)
+
+    @classmethod
+    def from_index(cls, index, column='price', nbins=30):
+        return cls(
+            index.frame[column].to_numpy(),
+            cells=index.cell_ids,
+            n_cells=int(np.prod(index.shape)),
+            nbins=nbins
+        )
+
+    @property
+    def nbytes(self):
+        return self.cell_counts.nbytes + self.edges.nbytes
+
+    def bin_ids(self, prices):
+        ids = np.searchsorted(self.edges, prices, side='right') - 1
+        # Values on or beyond the outer edges fall into the first/last bin
+        return np.clip(ids, 0, self.nbins - 1)
+
+    def add(self, prices, cells=None):
+        prices = np.asarray(prices, dtype=float)
+        cells = np.zeros(len(prices), dtype=np.int64) if cells is None else np.asarray(cells)
+        flat = cells * self.nbins + self.bin_ids(prices)
+        self.cell_counts += np.bincount(flat, minlength=self.cell_counts.size).reshape(self.cell_counts.shape)
+
+    def counts(self, cells=None):
+        if cells is None:
+            return self.cell_counts.sum(axis=0)
+        return self.cell_counts[np.asarray(cells, dtype=np.int64)].sum(axis=0)
+
+    def update(self, counts, added_cells=(), removed_cells=()):
+        # Move from one filter's counts to another's touching only changed cells
+        return counts + self.counts(added_cells) - self.counts(removed_cells)
+
+def compute_price_bins(prices, nbins=30):
+    histogram = PriceHistogram(prices, nbins=nbins)
+    return histogram.edges, histogram.counts()
+
+def figure_payload_bytes(fig):
+    return len(fig.to_json().encode('utf-8'))
+
+def create_binned_price_distribution_plot(edges, counts):
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_color='#FF385C',
+        hovertemplate='₹%{x:,.0f}<br>%{y} listings<extra></extra>'
+    ))
+    fig.update_layout(
+        title='Price Distribution in Your Area',
+        xaxis_title='price',
+        yaxis_title='count',
+        bargap=0,
+        template='plotly_white',
+        showlegend=False,
+        margin=dict(t=40, l=40, r=40, b=40)
+    )
+    return fig
+
+def create_price_distribution_plot(df, binned=False, nbins=30):
+    # Binned mode ships only bin edges and counts instead of every price row
+    if binned:
+        return create_binned_price_distribution_plot(*compute_price_bins(df['price'], nbins))
 
-def create_price_distribution_plot(df):
     fig = px.histogram(
         df,
         x='price',
-        nbins=30,
+        nbins=nbins,
         title='Price Distribution in Your Area',
         color_discrete_sequence=['#FF385C']
     )
@@ -17,21 +94,136 @@ def create_price_distribution_plot(df):
     )
     return fig
 
-def create_occupancy_trend(df):
+def create_occupancy_trend(df=None, max_points=None, method='lttb', webgl=False, window=None, rollups=None,
+                           forecast=None, anomalies=None, **filters):
+    # With a rollup store the window is read at the finest resolution that
+    # fits max_points; otherwise only the visible window is downsampled
+    resolution = 'daily'
+    if rollups is not None:
+        start, end = window if window is not None else (None, None)
+        df = rollups.query(start, end, max_points=max_points, **filters)
+        resolution = df.attrs['resolution']
+    elif window is not None:
+        start, end = (np.datetime64(pd.Timestamp(w)) for w in window)
+        df = df[(df['date'] >= start) & (df['date'] <= end)]
+    series = 'neighborhood' if 'neighborhood' in df.columns else None
+    if max_points is not None and resolution == 'daily':
+        df = downsample_series(df, series=series, max_points=max_points, method=method)
+
     fig = px.line(
         df,
         x='date',
         y='price',
-        title='Seasonal Price Trends',
-        color_discrete_sequence=['#00A699']
+        color=series,
+        title='Seasonal Price Trends' if resolution == 'daily' else f'Seasonal Price Trends ({resolution} average)',
+        color_discrete_sequence=['#00A699'],
+        render_mode='webgl' if webgl else 'auto'
     )
+    # Single coarse series: shade the range of daily prices in each period
+    if resolution != 'daily' and series is None:
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([df['date'], df['date'][::-1]]),
+            y=np.concatenate([df['price_max'], df['price_min'][::-1]]),
+            fill='toself',
+            fillcolor='rgba(0, 166, 153, 0.15)',
+            line=dict(width=0),
+            hoverinfo='skip',
+            name='Daily range'
+        ))
+    if forecast is not None:
+        add_forecast_traces(fig, forecast, series)
+    if anomalies is not None:
+        add_anomaly_markers(fig, anomalies, window)
     fig.update_layout(
         template='plotly_white',
         margin=dict(t=40, l=40, r=40, b=40)
     )
     return fig
 
-def create_competitor_comparison(df):
+def add_forecast_traces(fig, forecast, series=None):
+    # Dashed forecast per series, with the prediction band for a single series
+    groups = forecast.groupby(series, observed=True) if series else [(None, forecast)]
+    for name, group in groups:
+        label = 'Forecast' if name is None else f'{name} forecast'
+        if name is None:
+            fig.add_trace(go.Scatter(
+                x=np.concatenate([group['date'], group['date'][::-1]]),
+                y=np.concatenate([group['upper'], group['lower'][::-1]]),
+                fill='toself',
+                fillcolor='rgba(255, 90, 95, 0.15)',
+                line=dict(width=0),
+                hoverinfo='skip',
+                name='Forecast interval'
+            ))
+        fig.add_trace(go.Scatter(
+            x=group['date'],
+            y=group['price'],
+            mode='lines',
+            line=dict(color='#FF5A5F', dash='dash'),
+            name=label
+        ))
+    return fig
+
+ANOMALY_MARKERS = {
+    'spike': dict(symbol='triangle-up', color='#FF385C', size=9),
+    'dip': dict(symbol='triangle-down', color='#484848', size=9)
+}
+
+def add_anomaly_markers(fig, anomalies, window=None):
+    # Detected spikes and dips at their daily price, limited to the window
+    if window is not None:
+        start, end = (np.datetime64(pd.Timestamp(w)) for w in window)
+        anomalies = anomalies[(anomalies['date'] >= start) & (anomalies['date'] <= end)]
+    for kind, marker in ANOMALY_MARKERS.items():
+        events = anomalies[anomalies['kind'] == kind]
+        if len(events):
+            fig.add_trace(go.Scatter(
+                x=events['date'],
+                y=events['price'],
+                mode='markers',
+                marker=marker,
+                name=f'Price {kind}s',
+                customdata=np.column_stack([events['median'], events['score']]),
+                hovertemplate='%{x|%Y-%m-%d}: %{y:.0f} (median %{customdata[0]:.0f}, score %{customdata[1]:.1f})<extra></extra>'
+            ))
+    return fig
+
+def summarize_box(df, group='platform', value='price', max_outliers=50, seed=0):
+    codes, groups = pd.factorize(df[group], sort=False)
+    values = df[value].to_numpy(dtype=float)
+    by_group = pd.Series(values).groupby(codes)
+
+    quartiles = by_group.quantile([0.25, 0.5, 0.75]).unstack()
+    q1, median, q3 = (quartiles[q].to_numpy() for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+
+    # Whiskers end at the most extreme points still within 1.5 IQR, as in px.box
+    inside = (values >= (q1 - 1.5 * iqr)[codes]) & (values <= (q3 + 1.5 * iqr)[codes])
+    fenced = pd.Series(values[inside]).groupby(codes[inside])
+    summary = pd.DataFrame({
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': fenced.min().reindex(range(len(groups))).to_numpy(),
+        'upperfence': fenced.max().reindex(range(len(groups))).to_numpy(),
+        'count': by_group.size().to_numpy()
+    }, index=pd.Index(groups, name=group))
+
+    # Random, capped sample of outliers per group
+    outlier_rows = np.flatnonzero(~inside)
+    outlier_rows = outlier_rows[np.random.default_rng(seed).permutation(len(outlier_rows))]
+    keep = pd.Series(codes[outlier_rows]).groupby(codes[outlier_rows]).cumcount().to_numpy() < max_outliers
+    outlier_rows = outlier_rows[keep]
+    outliers = pd.DataFrame({
+        group: np.asarray(groups)[codes[outlier_rows]],
+        value: values[outlier_rows]
+    })
+    return summary, outliers
+
+def create_competitor_comparison(df, summary=False, max_outliers=50):
+    if summary:
+        return create_competitor_summary_comparison(*summarize_box(df, max_outliers=max_outliers))
+
     fig = px.box(
         df,
         x='platform',
@@ -46,13 +238,140 @@ def create_competitor_comparison(df):
     )
     return fig
 
-def create_metric_cards(df):
-    avg_price = df['price'].mean()
-    avg_rating = df['rating'].mean()
-    avg_occupancy = df['occupancy_rate'].mean()
-    
+def create_competitor_summary_comparison(summary, outliers):
+    # Built from precomputed quartiles, so payload size is independent of row count
+    colors = ['#FF385C', '#00A699', '#484848']
+    fig = go.Figure()
+    for idx, (platform, row) in enumerate(summary.iterrows()):
+        color = colors[idx % len(colors)]
+        fig.add_trace(go.Box(
+            name=str(platform),
+            x=[platform],
+            q1=[row['q1']],
+            median=[row['median']],
+            q3=[row['q3']],
+            lowerfence=[row['lowerfence']],
+            upperfence=[row['upperfence']],
+            marker_color=color,
+            legendgroup=str(platform)
+        ))
+        points = outliers.loc[outliers['platform'] == platform, 'price']
+        if len(points):
+            fig.add_trace(go.Scatter(
+                x=[platform] * len(points),
+                y=points,
+                mode='markers',
+                marker=dict(color=color, size=4),
+                legendgroup=str(platform),
+                showlegend=False
+            ))
+    fig.update_layout(
+        title='Price Comparison Across Platforms',
+        xaxis_title='platform',
+        yaxis_title='price',
+        template='plotly_white',
+        margin=dict(t=40, l=40, r=40, b=40)
+    )
+    return fig
+
+def create_roi_heatmap(nightly_rates, occupancy_rates, roi_grid, max_cells=200):
+    # Stride large grids down for display; the full surface stays server-side
+    row_step = max(1, int(np.ceil(len(occupancy_rates) / max_cells)))
+    col_step = max(1, int(np.ceil(len(nightly_rates) / max_cells)))
+    fig = go.Figure(go.Heatmap(
+        x=nightly_rates[::col_step],
+        y=occupancy_rates[::row_step],
+        z=roi_grid[::row_step, ::col_step],
+        colorscale='RdYlGn',
+        zmid=0,
+        colorbar=dict(title='ROI %'),
+        hovertemplate='Rate $%{x:,.0f}<br>Occupancy %{y:.0f}%<br>ROI %{z:.1f}%<extra></extra>'
+    ))
+    fig.update_layout(
+        title='ROI Sensitivity: Nightly Rate vs Occupancy',
+        xaxis_title='Nightly Rate ($)',
+        yaxis_title='Occupancy Rate (%)',
+        template='plotly_white',
+        margin=dict(t=40, l=40, r=40, b=40)
+    )
+    return fig
+
+def create_roi_distribution_plot(edges, counts, bands=None, max_bins=200):
+    # Merge the fine simulation histogram into at most max_bins bars,
+    # dropping the empty tails
+    nonzero = np.flatnonzero(counts)
+    if len(nonzero):
+        counts = counts[nonzero[0]:nonzero[-1] + 1]
+        edges = edges[nonzero[0]:nonzero[-1] + 2]
+    step = max(1, int(np.ceil(len(counts) / max_bins)))
+    merged = np.add.reduceat(counts, np.arange(0, len(counts), step))
+    merged_edges = np.append(edges[:-1:step], edges[-1])
+
+    fig = create_binned_price_distribution_plot(merged_edges, merged)
+    fig.update_traces(marker_color='#00A699', hovertemplate='%{x:.1f}%<br>%{y} scenarios<extra></extra>')
+    for label, value in (bands or {}).items():
+        fig.add_vline(x=value, line_dash='dash', line_color='#FF385C', annotation_text=label)
+    fig.update_layout(title='Simulated ROI Distribution', xaxis_title='ROI (%)', yaxis_title='scenarios')
+    return fig
+
+def create_cash_flow_projection(cash_flows):
+    # cash_flows: one property's monthly flows, month 0 being the down payment
+    monthly = np.asarray(cash_flows[1:], dtype=float)
+    annual = monthly.reshape(-1, 12).sum(axis=1)
+    years = np.arange(1, len(annual) + 1)
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=years, y=annual, name='Annual Cash Flow', marker_color='#00A699'))
+    fig.add_trace(go.Scatter(
+        x=np.concatenate([[0], years]),
+        y=np.cumsum(np.concatenate([[cash_flows[0]], annual])),
+        name='Cumulative',
+        mode='lines+markers',
+        line=dict(color='#FF385C')
+    ))
+    fig.update_layout(
+        title='Projected Cash Flow',
+        xaxis_title='Year',
+        yaxis_title='$',
+        template='plotly_white',
+        margin=dict(t=40, l=40, r=40, b=40)
+    )
+    return fig
+
+def create_metric_cards(df=None, store=None):
+    # With a MetricStore the means come from its running aggregates
+    if store is not None:
+        avg_price = store.overall['price'].mean
+        avg_rating = store.overall['rating'].mean
+        avg_occupancy = store.overall['occupancy_rate'].mean
+    else:
+        avg_price = df['price'].mean()
+        avg_rating = df['rating'].mean()
+        avg_occupancy = df['occupancy_rate'].mean()
+
     return {
         'Average Price': f'${avg_price:.2f}',
         'Average Rating': f'{avg_rating:.1f}',
         'Occupancy Rate': f'{avg_occupancy*100:.1f}%'
     }
+
+def create_metric_deltas(store):
+    # Latest window against the one before it
+    current, previous = store.latest_periods()
+    if current is None:
+        return {}
+    now, before = store.period_stats(current), store.period_stats(previous)
+
+    def change(metric):
+        if not now[metric].count or not before[metric].count:
+            return None
+        return now[metric].mean - before[metric].mean
+
+    price = change('price')
+    rating = change('rating')
+    occupancy = change('occupancy_rate')
+    return {
+        'Average Price': None if price is None else f"{price / before['price'].mean * 100:+.1f}%",
+        'Average Rating': None if rating is None else f"{rating:+.2f}",
+        'Occupancy Rate': None if occupancy is None else f"{occupancy * 100:+.1f} pp",
+        'Total Properties': f"+{store.window_counts.get(current, 0):,}"
+    }